@@ -13,140 +13,557 @@ from google.cloud import bigquery
 import re
 import time
 import json as json_module
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+import weakref
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    from google.cloud import bigquery_storage
+except ImportError:
+    # Storage Read API is optional; fall back to the REST row iterator
+    bigquery_storage = None
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds."""
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        return len(self._data)
+
+def _fold(text: str) -> str:
+    """NFKC + casefold, matching CONTAINS_SUBSTR's case-insensitive compare."""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+class RateLimiter:
+    """Thread-safe token bucket: allows `max_rate` calls per `period` seconds,
+    blocking only when the bucket is empty."""
+    
+    def __init__(self, max_rate: int, period: float = 60):
+        self.capacity = max_rate
+        self.refill_rate = max_rate / period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.refill_rate
+            time.sleep(wait)
+
+class SearchCache:
+    """SQLite-backed cache of search results that survives restarts.
+    
+    Rows are stored as JSON (dates become ISO strings) with an expiry
+    timestamp; expired entries are purged when the cache is opened.
+    """
+    
+    def __init__(self, db_path: str = "./data/search_cache.db", ttl: float = 6 * 3600):
+        self.ttl = ttl
+        self.db_file = Path(db_path)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), timeout=30, check_same_thread=False)
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL;")
+        except Exception:
+            pass
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, rows TEXT NOT NULL)"
+            )
+            self.conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (time.time(),))
+            self.conn.commit()
+    
+    @staticmethod
+    def _key(key) -> str:
+        return json_module.dumps(key, ensure_ascii=False)
+    
+    def get(self, key, default=None):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT rows FROM search_cache WHERE key = ? AND expires_at >= ?",
+                (self._key(key), time.time())
+            ).fetchone()
+        return json_module.loads(row[0]) if row else default
+    
+    def set(self, key, rows: list):
+        data = json_module.dumps(rows, ensure_ascii=False, default=str)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, expires_at, rows) VALUES (?, ?, ?)",
+                (self._key(key), time.time() + self.ttl, data)
+            )
+            self.conn.commit()
+    
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM search_cache")
+            self.conn.commit()
+
+@lru_cache(maxsize=4096)
+def dominant_script(text: str) -> str:
+    """Unicode script name (e.g. 'LATIN', 'DEVANAGARI') of most letters in
+    `text`, or '' if it has none."""
+    scripts = Counter(
+        unicodedata.name(ch, '').split(' ', 1)[0]
+        for ch in text if ch.isalpha()
+    )
+    return scripts.most_common(1)[0][0] if scripts else ''
+
+def _text_key(text: str, target_language: str) -> tuple:
+    """Cache key for a Gemini input that ignores case, Unicode form and
+    whitespace differences, so near-duplicate inputs share one entry."""
+    normalized = " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+    return (hashlib.sha1(normalized.encode("utf-8")).hexdigest(), target_language)
+
+def _search_term(word: str) -> str:
+    """Quote a word as a single SEARCH() term so operators in user input
+    are not interpreted by the search query syntax."""
+    esc = word.replace('\\', '\\\\').replace('`', '\\`')
+    return f"`{esc}`"
+
+def _query_config(params: list) -> bigquery.QueryJobConfig:
+    """Job config for a parameterized query.
+
+    The SQL text stays identical across searches, so repeat searches
+    with the same parameters are served from BigQuery's result cache.
+    """
+    return bigquery.QueryJobConfig(
+        query_parameters=params,
+        use_query_cache=True,
+        use_legacy_sql=False
+    )
+
+# Process-wide BigQuery clients, one per project, so every tool and agent
+# reuses the same credentials and connection pool
+_BQ_CLIENTS = {}
+_bq_clients_lock = threading.Lock()
+
+def _default_credentials():
+    """Service account from Streamlit secrets, or None for ADC."""
+    try:
+        import streamlit as st
+        from google.oauth2 import service_account
+        
+        if 'gcp_service_account' in st.secrets:
+            # Running on Streamlit Cloud - use secrets
+            return service_account.Credentials.from_service_account_info(
+                dict(st.secrets["gcp_service_account"])
+            )
+    except Exception:
+        pass
+    # Local: default credentials (GOOGLE_APPLICATION_CREDENTIALS / gcloud)
+    return None
+
+def get_bigquery_client(project_id: str, credentials=None) -> bigquery.Client:
+    """Shared BigQuery client for a project, created on first use.
+    
+    `credentials` only applies to the first call for a project; later
+    calls get the client that was already built.
+    """
+    with _bq_clients_lock:
+        if project_id not in _BQ_CLIENTS:
+            if credentials is None:
+                credentials = _default_credentials()
+            if credentials is not None:
+                _BQ_CLIENTS[project_id] = bigquery.Client(project=project_id, credentials=credentials)
+            else:
+                _BQ_CLIENTS[project_id] = bigquery.Client(project=project_id)
+        return _BQ_CLIENTS[project_id]
 
 class BigQuerySearchTool:
     """Search across RSS and DIKSHA tables."""
     
-    def __init__(self, project_id: str):
-        """Initialize BigQuery search tool with proper credentials"""
+    # Queries whose dry run estimates more bytes than this are refused
+    MAX_BYTES_PER_QUERY = int(os.getenv("BQ_MAX_BYTES_PER_QUERY", str(10**9)))
+    
+    # On-disk result cache shared across sessions; empty path disables it
+    SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", "./data/search_cache.db")
+    SEARCH_CACHE_TTL_HOURS = float(os.getenv("SEARCH_CACHE_TTL_HOURS", "6"))
+    
+    # Text columns covered by each table's search index
+    RSS_SEARCH_COLUMNS = ("title", "description", "content")
+    DIKSHA_SEARCH_COLUMNS = ("title", "description")
+    
+    # Result field -> SELECT expression for each table
+    RSS_FIELDS = {
+        "id": "id",
+        "title": "title",
+        "content": "content",
+        "description": "description",
+        "language": "language",
+        "source": "source",
+        "url": "url",
+        "published_date": "published_date",
+    }
+    # language/grade_level/subject are JSON arrays; decode them in BigQuery
+    # so they arrive as ARRAY<STRING> (Python lists) with no per-row parsing
+    DIKSHA_FIELDS = {
+        "id": "content_id as id",
+        "title": "title",
+        "description": "description",
+        "language": "JSON_VALUE_ARRAY(language) as language",
+        "source": "'DIKSHA' as source",
+        "board": "board",
+        "grade_level": "JSON_VALUE_ARRAY(grade_level) as grade_level",
+        "subject": "JSON_VALUE_ARRAY(subject) as subject",
+        "url": "diksha_url as url",
+        "published_date": "created_on as published_date",
+    }
+    
+    # BigQuery client -> its Storage Read API client (shared like the clients)
+    _bqstorage_clients = {}
+    
+    def __init__(self, project_id: str, client: bigquery.Client = None):
+        """Initialize BigQuery search tool.
         
-        # Get credentials from Streamlit secrets if available
-        try:
-            import streamlit as st
-            from google.oauth2 import service_account
-            
-            if 'gcp_service_account' in st.secrets:
-                # Running on Streamlit Cloud - use secrets
-                credentials = service_account.Credentials.from_service_account_info(
-                    dict(st.secrets["gcp_service_account"])
+        Pass `client` to share an existing BigQuery client; otherwise the
+        process-wide client for `project_id` is used.
+        """
+        self.client = client if client is not None else get_bigquery_client(project_id)
+        
+        # Storage Read API client: streams results as Arrow over gRPC instead
+        # of paging rows through the REST API
+        self.bqstorage_client = self._bqstorage_clients.get(self.client)
+        if self.bqstorage_client is None and bigquery_storage is not None:
+            try:
+                self.bqstorage_client = bigquery_storage.BigQueryReadClient(
+                    credentials=self.client._credentials
                 )
-                self.client = bigquery.Client(project=project_id, credentials=credentials)
-            else:
-                # Local with default credentials
-                self.client = bigquery.Client(project=project_id)
-        except:
-            # Fallback: use default credentials (works locally with GOOGLE_APPLICATION_CREDENTIALS)
-            self.client = bigquery.Client(project=project_id)
+                self._bqstorage_clients[self.client] = self.bqstorage_client
+            except Exception as e:
+                logger.warning("Storage Read API unavailable, using REST: %s", e)
+        
+        # Process-local result cache in front of BigQuery. _by_shape keeps
+        # the largest-limit result of each search regardless of limit: the
+        # first N rows of a LIMIT M search (M >= N) are the LIMIT N result.
+        self._cache = TTLCache(maxsize=512, ttl=300)
+        self._by_shape = TTLCache(maxsize=512, ttl=300)
+        
+        # Second tier on disk, so repeat searches skip BigQuery across restarts
+        self._disk_cache = None
+        if self.SEARCH_CACHE_PATH:
+            try:
+                self._disk_cache = SearchCache(self.SEARCH_CACHE_PATH,
+                                               ttl=self.SEARCH_CACHE_TTL_HOURS * 3600)
+            except Exception as e:
+                logger.warning("Search cache unavailable: %s", e)
+        
+        # table -> whether an ACTIVE search index exists (looked up lazily)
+        self._search_indexed = {}
+        
+        # (SQL text, TIMESTAMP params) -> dry-run byte estimate. Queries are
+        # parameterized, so the same SQL shape is only dry-run once an hour;
+        # the date cutoff is part of the key because it changes partition
+        # pruning and therefore the bytes scanned.
+        self._dry_run_bytes = TTLCache(maxsize=256, ttl=3600)
         
         self.project_id = project_id
         self.rss_table = f"{project_id}.rss_connector.rss_content"
         self.diksha_table = f"{project_id}.diksha_connector.diksha_content"
         
-        print(f"BigQuerySearchTool initialized")
-        print(f"  RSS: {self.rss_table}")
-        print(f"  DIKSHA: {self.diksha_table}")
+        logger.info("BigQuerySearchTool initialized (RSS: %s, DIKSHA: %s, Storage Read API: %s)",
+                    self.rss_table, self.diksha_table, 'on' if self.bqstorage_client else 'off')
+
+    def _start_query(self, sql: str, params: list):
+        """Start a query job, or return None if a dry run estimates it would
+        scan more than MAX_BYTES_PER_QUERY."""
+        estimate_key = (sql, tuple((p.name, p.value) for p in params
+                                   if getattr(p, "type_", None) == "TIMESTAMP"))
+        estimate = self._dry_run_bytes.get(estimate_key)
+        if estimate is None:
+            dry_config = _query_config(params)
+            dry_config.dry_run = True
+            dry_config.use_query_cache = False
+            estimate = self.client.query(sql, job_config=dry_config).total_bytes_processed or 0
+            self._dry_run_bytes.set(estimate_key, estimate)
+        logger.debug("Estimated scan: %.1f MB", estimate / 1e6)
+        
+        if estimate > self.MAX_BYTES_PER_QUERY:
+            logger.warning("Rejected: scan exceeds %.0f MB limit", self.MAX_BYTES_PER_QUERY / 1e6)
+            return None
+        
+        config = _query_config(params)
+        config.maximum_bytes_billed = self.MAX_BYTES_PER_QUERY
+        return self.client.query(sql, job_config=config)
+
+    def _fetch_rows(self, job) -> list:
+        """Wait for a query job and return its rows as a list of dicts.
+
+        Rows are downloaded as Arrow (over the Storage Read API when
+        available, REST pages otherwise) and converted column-wise in C
+        with to_pylist(). Only falls back to building a dict per row when
+        pyarrow isn't installed.
+        """
+        if self.bqstorage_client is not None:
+            try:
+                arrow_table = job.result().to_arrow(bqstorage_client=self.bqstorage_client)
+                return arrow_table.to_pylist()
+            except Exception as e:
+                logger.warning("Storage Read API failed, using REST: %s", e)
+        try:
+            return job.result().to_arrow(create_bqstorage_client=False).to_pylist()
+        except ImportError:
+            return [dict(row) for row in job.result()]
+
+    def create_search_indexes(self):
+        """Create the search indexes used by SEARCH(). Safe to re-run."""
+        for table, columns in [(self.rss_table, self.RSS_SEARCH_COLUMNS),
+                               (self.diksha_table, self.DIKSHA_SEARCH_COLUMNS)]:
+            index_name = table.split(".")[-1] + "_search_idx"
+            ddl = f"""
+            CREATE SEARCH INDEX IF NOT EXISTS {index_name}
+            ON `{table}`({', '.join(columns)})
+            OPTIONS (analyzer = 'LOG_ANALYZER')
+            """
+            logger.info("Creating search index %s...", index_name)
+            self.client.query(ddl).result()
+        self._search_indexed.clear()
+
+    def _has_search_index(self, table: str) -> bool:
+        """Whether `table` has an ACTIVE search index (cached per table)."""
+        if table not in self._search_indexed:
+            project, dataset, table_name = table.split(".")
+            sql = f"""
+            SELECT COUNT(*) AS n
+            FROM `{project}.{dataset}.INFORMATION_SCHEMA.SEARCH_INDEXES`
+            WHERE table_name = @table_name AND index_status = 'ACTIVE'
+            """
+            try:
+                job = self.client.query(sql, job_config=_query_config([
+                    bigquery.ScalarQueryParameter("table_name", "STRING", table_name)
+                ]))
+                self._search_indexed[table] = next(iter(job.result())).n > 0
+            except Exception as e:
+                logger.warning("Search index lookup failed for %s, using substring scan: %s", table_name, e)
+                self._search_indexed[table] = False
+        return self._search_indexed[table]
+
+    def _word_clauses(self, table: str, columns: tuple, words: list, params: list) -> list:
+        """One predicate per word matching any of `columns`.
+        
+        Uses SEARCH() token lookups when the table has a search index and
+        falls back to case-insensitive CONTAINS_SUBSTR() scans otherwise.
+        """
+        use_index = self._has_search_index(table)
+        clauses = []
+        for i, word in enumerate(words):
+            if use_index:
+                params.append(bigquery.ScalarQueryParameter(f"w{i}", "STRING", _search_term(word)))
+                clauses.append("(" + " OR ".join(
+                    f"SEARCH({col}, @w{i}, analyzer => 'LOG_ANALYZER')" for col in columns
+                ) + ")")
+            else:
+                params.append(bigquery.ScalarQueryParameter(f"w{i}", "STRING", word))
+                clauses.append("(" + " OR ".join(
+                    f"CONTAINS_SUBSTR({col}, @w{i})" for col in columns
+                ) + ")")
+        return clauses
+
+    def clear_cache(self):
+        """Drop all cached search results."""
+        self._cache.clear()
+        self._by_shape.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
+    @staticmethod
+    def _select_list(field_map: dict, fields: list, content_source: str) -> str:
+        """SELECT expressions for the requested fields (all when None)."""
+        exprs = [expr for name, expr in field_map.items() if fields is None or name in fields]
+        exprs.append(f"'{content_source}' as content_source")
+        return ",\n                ".join(exprs)
+
+    def _iter_rows(self, job, page_size: int = 25):
+        """Yield a query job's rows as dicts, one Arrow page at a time.
+
+        Record batches come over the Storage Read API streams when a
+        client is available. If the read session can't be opened, the
+        rows are paged over REST instead, like _fetch_rows().
+        """
+        rows = job.result(page_size=page_size)
+        try:
+            batches = iter(rows.to_arrow_iterable(bqstorage_client=self.bqstorage_client))
+            first = next(batches, None)
+        except ImportError:
+            yield from (dict(row) for row in job.result(page_size=page_size))
+            return
+        except Exception as e:
+            if self.bqstorage_client is None:
+                raise
+            logger.warning("Storage Read API failed, using REST: %s", e)
+            batches = iter(job.result(page_size=page_size).to_arrow_iterable(
+                bqstorage_client=None))
+            first = next(batches, None)
+        if first is None:
+            return
+        yield from first.to_pylist()
+        for batch in batches:
+            yield from batch.to_pylist()
 
     def search(self, query: str, limit: int = 5, languages: list = None, 
-               content_type: str = "All") -> list:
-        """Search across RSS and DIKSHA tables."""
-        print(f"\nBigQuery Search")
-        print(f"   Query: {query}")
-        print(f"   Languages: {languages or 'All'}")
-        print(f"   Limit: {limit}")
-        
-        words = re.split(r'\s+', query.strip())
+               content_type: str = "All", fields: list = None,
+               max_age_days: int = None) -> list:
+        """Search across RSS and DIKSHA tables.
+        
+        `fields` limits the columns read (e.g. ["title", "url"]) so large
+        text columns are not scanned when not needed. `max_age_days` only
+        keeps news published in the last N days, letting BigQuery prune
+        partitions of the RSS table.
+        """
+        return list(self.search_iter(query, limit, languages, content_type, fields, max_age_days))
+
+    def search_iter(self, query: str, limit: int = 5, languages: list = None, 
+                    content_type: str = "All", fields: list = None,
+                    max_age_days: int = None):
+        """Like search(), but yields rows as they arrive from BigQuery so
+        callers can start processing before the whole result set is in."""
+        logger.debug("BigQuery search: query=%r languages=%s limit=%d",
+                     query, languages or 'All', limit)
+        
+        words = query.split()
         if not words:
-            return []
+            return
         
-        results = []
+        # Matching is case-insensitive and language order doesn't matter,
+        # so normalize both before keying the caches
+        cache_key = (" ".join(_fold(query).split()), limit, tuple(sorted(languages or ())),
+                     content_type, tuple(fields) if fields else None, max_age_days)
+        cached = self._cache.get(cache_key)
+        if cached is None and self._disk_cache is not None:
+            cached = self._disk_cache.get(cache_key)
+            if cached is not None:
+                self._cache.set(cache_key, cached)
+        if cached is not None:
+            logger.debug("Cache hit: %s results", len(cached))
+            # Callers may modify the rows they get; hand out copies
+            yield from (dict(row) for row in cached)
+            return
+        
+        # Same search with a larger limit already answered: take its prefix
+        shape_key = cache_key[:1] + cache_key[2:]
+        wider = self._by_shape.get(shape_key)
+        if wider is not None and wider[0] >= limit:
+            logger.debug("Wider cached search hit: %s results", min(limit, len(wider[1])))
+            yield from (dict(row) for row in wider[1][:limit])
+            return
+        
+        # Parameters shared by both tables, built once
+        base_params = [bigquery.ScalarQueryParameter("limit", "INT64", limit)]
+        if languages:
+            base_params.append(bigquery.ArrayQueryParameter("langs", "STRING", list(languages)))
+        
+        jobs = {}
+        failed = False
         
         # RSS TABLE (language is STRING)
         if content_type in ["All", "News"]:
-            where_clauses = []
-            for word in words:
-                if word:
-                    esc = word.replace("'", "\\'")
-                    where_clauses.append(
-                        f"(LOWER(title) LIKE LOWER('%{esc}%') OR "
-                        f"LOWER(COALESCE(description, '')) LIKE LOWER('%{esc}%') OR "
-                        f"LOWER(COALESCE(content, '')) LIKE LOWER('%{esc}%'))"
-                    )
+            params = list(base_params)
+            where_condition = " OR ".join(
+                self._word_clauses(self.rss_table, self.RSS_SEARCH_COLUMNS, words, params)
+            )
             
-            where_condition = " OR ".join(where_clauses) if where_clauses else "1=1"
+            lang_filter = "AND language IN UNNEST(@langs)" if languages else ""
             
-            lang_filter = ""
-            if languages:
-                lang_list = "', '".join(languages)
-                lang_filter = f"AND language IN ('{lang_list}')"
+            # Cutoff is computed here (day-aligned) rather than with
+            # CURRENT_TIMESTAMP(), which would make the query uncacheable
+            date_filter = ""
+            if max_age_days:
+                today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+                params.append(bigquery.ScalarQueryParameter(
+                    "since", "TIMESTAMP", today - timedelta(days=max_age_days)
+                ))
+                date_filter = "AND published_date >= @since"
             
             rss_sql = f"""
             SELECT
-                id,
-                title,
-                content,
-                description,
-                language,
-                source,
-                url,
-                published_date,
-                'rss' as content_source
+                {self._select_list(self.RSS_FIELDS, fields, 'rss')}
             FROM
                 `{self.rss_table}`
             WHERE
                 ({where_condition})
                 {lang_filter}
+                {date_filter}
             ORDER BY
                 published_date DESC
-            LIMIT {limit}
+            LIMIT @limit
             """
             
             try:
-                print(f"   Querying RSS...")
-                rss_results = self.client.query(rss_sql).result()
-                count = 0
-                for row in rss_results:
-                    results.append(dict(row))
-                    count += 1
-                print(f"   RSS: {count} results")
+                logger.debug("Querying RSS...")
+                job = self._start_query(rss_sql, params)
+                if job is not None:
+                    jobs['RSS'] = job
             except Exception as e:
-                print(f"   RSS error: {e}")
+                logger.warning("RSS error: %s", e)
+                failed = True
         
         # DIKSHA TABLE (language is JSON)
         if content_type in ["All", "Education"]:
-            where_clauses = []
-            for word in words:
-                if word:
-                    esc = word.replace("'", "\\'")
-                    where_clauses.append(
-                        f"(LOWER(title) LIKE LOWER('%{esc}%') OR "
-                        f"LOWER(COALESCE(description, '')) LIKE LOWER('%{esc}%'))"
-                    )
-            
-            where_condition = " OR ".join(where_clauses) if where_clauses else "1=1"
+            params = list(base_params)
+            where_condition = " OR ".join(
+                self._word_clauses(self.diksha_table, self.DIKSHA_SEARCH_COLUMNS, words, params)
+            )
             
-            # FIXED: Use TO_JSON_STRING instead of CAST for JSON language field
+            # language is a JSON array: unnest it natively rather than
+            # string-matching its serialized form
             lang_filter = ""
             if languages:
-                lang_conditions = []
-                for lang in languages:
-                    lang_conditions.append(
-                        f"TO_JSON_STRING(language) LIKE '%\"{lang}\"%'"
-                    )
-                lang_filter = f"AND ({' OR '.join(lang_conditions)})"
+                lang_filter = (
+                    "AND EXISTS (SELECT 1 FROM UNNEST(JSON_VALUE_ARRAY(language)) AS lang "
+                    "WHERE lang IN UNNEST(@langs))"
+                )
             
             diksha_sql = f"""
             SELECT
-                content_id as id,
-                title,
-                description,
-                language,
-                'DIKSHA' as source,
-                board,
-                grade_level,
-                subject,
-                diksha_url as url,
-                created_on as published_date,
-                'diksha' as content_source
+                {self._select_list(self.DIKSHA_FIELDS, fields, 'diksha')}
             FROM
                 `{self.diksha_table}`
             WHERE
@@ -154,91 +571,638 @@ class BigQuerySearchTool:
                 {lang_filter}
             ORDER BY
                 created_on DESC
-            LIMIT {limit}
+            LIMIT @limit
             """
             
             try:
-                print(f"   Querying DIKSHA...")
-                diksha_results = self.client.query(diksha_sql).result()
-                count = 0
-                for row in diksha_results:
-                    row_dict = dict(row)
-                    for json_field in ['language', 'grade_level', 'subject']:
-                        if json_field in row_dict and isinstance(row_dict[json_field], str):
-                            try:
-                                row_dict[json_field] = json_module.loads(row_dict[json_field])
-                            except:
-                                pass
-                    results.append(row_dict)
-                    count += 1
-                print(f"   DIKSHA: {count} results")
+                logger.debug("Querying DIKSHA...")
+                job = self._start_query(diksha_sql, params)
+                if job is not None:
+                    jobs['DIKSHA'] = job
             except Exception as e:
-                print(f"   DIKSHA error: {e}")
+                logger.warning("DIKSHA error: %s", e)
+                failed = True
+        
+        # Both jobs are already running server-side. Stream the first one to
+        # the caller while the other is downloaded in the background.
+        results = []
+        names = list(jobs)
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            prefetch = {name: pool.submit(self._fetch_rows, jobs[name]) for name in names[1:]}
+            for name in names:
+                count = 0
+                try:
+                    rows = self._iter_rows(jobs[name]) if name == names[0] else prefetch[name].result()
+                    for row in rows:
+                        # Keep our own copy for the caches: the caller gets
+                        # `row` before the results are stored
+                        results.append(dict(row))
+                        count += 1
+                        yield row
+                        if len(results) >= limit:
+                            break
+                    logger.debug("%s: %s results", name, count)
+                except Exception as e:
+                    logger.warning("%s error: %s", name, e)
+                    failed = True
+                if len(results) >= limit:
+                    break
+        finally:
+            pool.shutdown(wait=False)
+        
+        logger.debug("Total: %s results", len(results))
         
-        print(f"   Total: {len(results)} results")
-        return results[:limit]
+        # Don't cache partial results from a failed query
+        if not failed:
+            self._cache.set(cache_key, results)
+            if self._disk_cache is not None:
+                try:
+                    self._disk_cache.set(cache_key, results)
+                except Exception as e:
+                    logger.warning("Search cache write failed: %s", e)
+            wider = self._by_shape.get(shape_key)
+            if wider is None or wider[0] < limit:
+                self._by_shape.set(shape_key, (limit, results))
+
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Shared by every Gemini tool; defaults to the free-tier 10 requests/minute
+gemini_limiter = RateLimiter(max_rate=int(os.getenv("GEMINI_MAX_RPM", "10")), period=60)
+
+# Process-wide Vertex AI state: vertexai.init() runs once per
+# (project, location), and models are built once and shared by every tool
+_vertex_initialized = set()
+_MODELS = {}
+_models_lock = threading.Lock()
+
+def init_vertexai(project: str, location: str, credentials=None):
+    """Call vertexai.init() unless it already ran for this project/location."""
+    key = (project, location)
+    if key in _vertex_initialized:
+        return
+    if credentials is not None:
+        vertexai.init(project=project, location=location, credentials=credentials)
+    else:
+        vertexai.init(project=project, location=location)
+    _vertex_initialized.add(key)
+
+def _get_model(name: str, system_instruction: str = None) -> GenerativeModel:
+    """Shared GenerativeModel for a model name and system instruction."""
+    key = (name, system_instruction)
+    with _models_lock:
+        if key not in _MODELS:
+            _MODELS[key] = GenerativeModel(name, system_instruction=system_instruction)
+        return _MODELS[key]
+
+# Seconds between keepalive pings to Vertex AI; 0 disables them
+GEMINI_KEEPALIVE_SECONDS = float(os.getenv("GEMINI_KEEPALIVE_SECONDS", "25"))
+# Pings stop after this many seconds without a keep_warm() call
+GEMINI_KEEPALIVE_IDLE_SECONDS = float(os.getenv("GEMINI_KEEPALIVE_IDLE_SECONDS", "600"))
+
+_keepalive_owners = weakref.WeakSet()
+_keepalive_thread = None
+_keepalive_stop = threading.Event()
+_keepalive_last_use = 0.0
+_keepalive_lock = threading.Lock()
+
+def _keepalive_loop(interval: float, stop: threading.Event):
+    global _keepalive_thread
+    model = _get_model(GEMINI_MODEL)
+    while not stop.wait(interval):
+        with _keepalive_lock:
+            idle = time.monotonic() - _keepalive_last_use > GEMINI_KEEPALIVE_IDLE_SECONDS
+            if not _keepalive_owners or idle:
+                _keepalive_thread = None
+                return
+        try:
+            # count_tokens is not billed and doesn't use generation quota
+            model.count_tokens("ping")
+        except Exception as e:
+            logger.debug("Keepalive ping failed: %s", e)
+
+def keep_warm(owner, interval: float = GEMINI_KEEPALIVE_SECONDS):
+    """Keep the Vertex AI connection warm while `owner` is alive and in use.
+    
+    One daemon thread per process pings the API every `interval`
+    seconds so the first Gemini call after idle doesn't pay for a new
+    connection. Call again whenever `owner` uses Gemini: the thread exits
+    after GEMINI_KEEPALIVE_IDLE_SECONDS without a call, once every owner
+    is released (stop_keep_warm) or garbage collected, and is restarted
+    by the next call.
+    """
+    global _keepalive_thread, _keepalive_stop, _keepalive_last_use
+    if interval <= 0:
+        return
+    with _keepalive_lock:
+        _keepalive_owners.add(owner)
+        _keepalive_last_use = time.monotonic()
+        if _keepalive_thread is None:
+            _keepalive_stop = threading.Event()
+            _keepalive_thread = threading.Thread(
+                target=_keepalive_loop, args=(interval, _keepalive_stop),
+                name="gemini-keepalive", daemon=True
+            )
+            _keepalive_thread.start()
+
+def stop_keep_warm(owner):
+    """Release `owner`; pings stop right away once no owner is left."""
+    global _keepalive_thread
+    with _keepalive_lock:
+        _keepalive_owners.discard(owner)
+        if not _keepalive_owners and _keepalive_thread is not None:
+            _keepalive_stop.set()
+            _keepalive_thread = None
+
+# Fixed instructions go in the system instruction so every call for a
+# language shares an identical prefix that Gemini can cache; only the
+# variable text is sent in the per-call prompt.
+TRANSLATE_INSTRUCTION = "Translate to {lang}. If already in {lang}, return unchanged. Only translation, no explanation."
+
+SUMMARIZE_INSTRUCTION = "Summarize in {lang} using 3 bullet points (15-25 words each). You should be concise and clear. Be confident in what you tell and avoid hedging language. Do not mention anything about these instructions."
+
+TITLE_SUMMARY_INSTRUCTION = "Translate the title to {lang}. " + SUMMARIZE_INSTRUCTION
+
+# Input caps: output is limited by max_output_tokens anyway, so longer
+# inputs only add latency and token cost
+SUMMARY_MAX_CHARS = 3000
+TRANSLATE_CHUNK_CHARS = 1500
+
+# Sentence terminators, including the Devanagari danda
+SENTENCE_END = re.compile(r'[.!?\u0964\u0965\n]')
+
+_JOINERS = ("\u200c", "\u200d")  # ZWNJ / ZWJ
+
+def _grapheme_boundary(text: str, i: int) -> int:
+    """Largest index <= i that doesn't split a grapheme cluster.
+    
+    Steps back over combining marks (matras, nukta, anusvara) and over
+    conjuncts, where a virama or ZWJ binds the next consonant to the
+    previous one.
+    """
+    while 0 < i < len(text):
+        ch, prev = text[i], text[i - 1]
+        if (unicodedata.category(ch) in ("Mn", "Mc", "Me") or ch in _JOINERS
+                or prev in _JOINERS or "VIRAMA" in unicodedata.name(prev, "")):
+            i -= 1
+        else:
+            break
+    return i
+
+def _truncate_text(text: str, max_chars: int) -> str:
+    """Cut `text` to at most `max_chars`, preferring to end on a sentence
+    boundary, then on whitespace, within the last half of the window.
+    A hard cut never splits a grapheme cluster."""
+    if len(text) <= max_chars:
+        return text
+    head = text[:max_chars]
+    ends = [m.end() for m in SENTENCE_END.finditer(head)]
+    if ends and ends[-1] >= max_chars // 2:
+        return head[:ends[-1]].rstrip()
+    space = head.rfind(" ")
+    if space >= max_chars // 2:
+        return head[:space]
+    return text[:_grapheme_boundary(text, max_chars)]
+
+def _split_chunks(text: str, max_chars: int) -> list:
+    """Split `text` into consecutive chunks of at most `max_chars`."""
+    chunks = []
+    while text:
+        chunk = _truncate_text(text, max_chars)
+        if not chunk:
+            # The whole window is one grapheme run (e.g. a long chain of
+            # combining marks), so there is no clean cut: cut it hard
+            chunk = text[:max_chars]
+        chunks.append(chunk.strip())
+        text = text[len(chunk):].lstrip()
+    return [c for c in chunks if c]
+
+def _generate_stream(model: GenerativeModel, prompt: str, generation_config: dict):
+    """Yield response text as Gemini streams it, instead of blocking until
+    the whole response has been generated."""
+    gemini_limiter.acquire()
+    for chunk in model.generate_content(prompt, generation_config=generation_config, stream=True):
+        try:
+            piece = chunk.text
+        except ValueError:
+            # Chunks carrying only finish/safety metadata have no text
+            continue
+        if piece:
+            yield piece
+
+# Structured output for batched calls: one string per numbered input
+STRING_ARRAY_SCHEMA = {"type": "ARRAY", "items": {"type": "STRING"}}
+
+# Structured output for summarize_translated(): translated title + summary
+TITLE_SUMMARY_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {"title": {"type": "STRING"}, "summary": {"type": "STRING"}},
+    "required": ["title", "summary"]
+}
+
+def _generate_list(model: GenerativeModel, instruction: str, texts: list,
+                   generation_config: dict) -> list:
+    """Send several texts in one numbered prompt and parse the JSON array
+    reply. Raises ValueError if the reply doesn't have one item per text."""
+    numbered = "\n".join(f'{n}. "{text}"' for n, text in enumerate(texts, 1))
+    prompt = f"""{instruction} Respond with a JSON array of strings, one per item, in the same order.
+
+{numbered}"""
+    
+    gemini_limiter.acquire()
+    response = model.generate_content(
+        prompt,
+        generation_config={
+            **generation_config,
+            "response_mime_type": "application/json",
+            "response_schema": STRING_ARRAY_SCHEMA
+        }
+    )
+    items = json_module.loads(response.text)
+    if not isinstance(items, list) or len(items) != len(texts):
+        raise ValueError(f"expected {len(texts)} items, got {len(items) if isinstance(items, list) else type(items).__name__}")
+    return [str(item).strip() for item in items]
+
+# Optional self-hosted translation (TRANSLATION_BACKEND=local). Needs
+# `pip install transformers torch sentencepiece`; Gemini is the fallback.
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "gemini")
+LOCAL_MT_MODEL = os.getenv("LOCAL_MT_MODEL", "facebook/nllb-200-distilled-600M")
+# "int8" quantizes Linear layers on CPU (VNNI/AMX int8 kernels); "none" keeps fp32
+LOCAL_MT_QUANTIZE = os.getenv("LOCAL_MT_QUANTIZE", "int8")
+
+# NLLB-200 language tags, by target language name and by source script
+NLLB_LANGUAGES = {
+    'English': 'eng_Latn',
+    'Hindi': 'hin_Deva',
+    'Telugu': 'tel_Telu',
+    'Tamil': 'tam_Taml',
+    'Marathi': 'mar_Deva',
+    'Gujarati': 'guj_Gujr',
+    'Kannada': 'kan_Knda',
+    'Malayalam': 'mal_Mlym',
+    'Bengali': 'ben_Beng',
+    'Punjabi': 'pan_Guru'
+}
+NLLB_SCRIPTS = {
+    'LATIN': 'eng_Latn',
+    'DEVANAGARI': 'hin_Deva',
+    'TELUGU': 'tel_Telu',
+    'TAMIL': 'tam_Taml',
+    'GUJARATI': 'guj_Gujr',
+    'KANNADA': 'kan_Knda',
+    'MALAYALAM': 'mal_Mlym',
+    'BENGALI': 'ben_Beng',
+    'GURMUKHI': 'pan_Guru'
+}
+
+class LocalTranslator:
+    """In-process NLLB-200 translation, batched on GPU when available."""
+    
+    def __init__(self, model_name: str = LOCAL_MT_MODEL, quantize: str = LOCAL_MT_QUANTIZE):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+        
+        self.torch = torch
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        dtype = torch.float16 if self.device == "cuda" else torch.float32
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=dtype).to(self.device)
+        self.model.eval()
+        
+        # Dynamic int8 weights halve memory bandwidth for the encoder/decoder
+        # matmuls. GPU stays fp16, which is already faster than int8 there.
+        self.precision = "fp16" if self.device == "cuda" else "fp32"
+        if quantize == "int8" and self.device == "cpu":
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.precision = "int8"
+        
+        self._lock = threading.Lock()
+        logger.info("LocalTranslator loaded %s on %s (%s)", model_name, self.device, self.precision)
+    
+    def supports(self, text: str, target_language: str) -> bool:
+        return target_language in NLLB_LANGUAGES and dominant_script(text) in NLLB_SCRIPTS
+    
+    def translate_batch(self, texts: list, target_language: str) -> list:
+        """Translate texts (all `supports()`-ed) in one generate() per source script."""
+        results = [None] * len(texts)
+        by_source = {}
+        for i, text in enumerate(texts):
+            by_source.setdefault(NLLB_SCRIPTS[dominant_script(text)], []).append(i)
+        
+        target = NLLB_LANGUAGES[target_language]
+        # The tokenizer's src_lang is shared state, so one batch at a time
+        with self._lock, self.torch.inference_mode():
+            for source, indices in by_source.items():
+                if source == target:
+                    for i in indices:
+                        results[i] = texts[i]
+                    continue
+                self.tokenizer.src_lang = source
+                inputs = self.tokenizer(
+                    [texts[i] for i in indices], return_tensors="pt",
+                    padding=True, truncation=True, max_length=512
+                ).to(self.device)
+                outputs = self.model.generate(
+                    **inputs,
+                    forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(target),
+                    num_beams=1,
+                    max_new_tokens=512
+                )
+                decoded = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+                for i, translation in zip(indices, decoded):
+                    results[i] = translation.strip()
+        return results
+
+_local_translator = None
+_local_translator_failed = False
+_local_translator_lock = threading.Lock()
+
+def _get_local_translator():
+    """Shared LocalTranslator, loaded on first use; None when the local
+    backend is disabled or can't be loaded."""
+    global _local_translator, _local_translator_failed
+    if TRANSLATION_BACKEND != "local" or _local_translator_failed:
+        return None
+    with _local_translator_lock:
+        if _local_translator is None and not _local_translator_failed:
+            try:
+                _local_translator = LocalTranslator()
+            except Exception as e:
+                logger.warning("LocalTranslator unavailable, using Gemini: %s", e)
+                _local_translator_failed = True
+        return _local_translator
 
 class TranslationTool:
     """Translation using Gemini."""
     
     def __init__(self):
-        self.model = GenerativeModel("gemini-2.0-flash")
-        print(f"TranslationTool initialized")
+        self._cache = TTLCache(maxsize=10_000, ttl=24 * 3600)
+        logger.info("TranslationTool initialized")
+    
+    def _model_for(self, target_language: str) -> GenerativeModel:
+        """Model carrying the translation instructions for one language."""
+        return _get_model(GEMINI_MODEL, TRANSLATE_INSTRUCTION.format(lang=target_language))
     
     def translate(self, text: str, target_language: str = "English") -> str:
         if not text or len(text.strip()) == 0:
             return ""
         
-        print(f"   Translating to {target_language}...")
+        key = _text_key(text, target_language)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Translation cache hit")
+            return cached
         
-        prompt = f"""Translate to {target_language}. If already in {target_language}, return unchanged. Only translation, no explanation.
-
-Text: "{text}"
+        # Long text: translate sentence-aligned chunks in parallel (still
+        # bounded by the shared rate limiter) and rejoin them
+        if len(text) > TRANSLATE_CHUNK_CHARS:
+            chunks = _split_chunks(text, TRANSLATE_CHUNK_CHARS)
+            logger.debug("Translating %s chunks to %s...", len(chunks), target_language)
+            with ThreadPoolExecutor(max_workers=min(4, len(chunks))) as pool:
+                parts = list(pool.map(lambda chunk: self.translate(chunk, target_language), chunks))
+            return " ".join(parts)
+        
+        logger.debug("Translating to %s...", target_language)
+        
+        local = _get_local_translator()
+        if local is not None and local.supports(text, target_language):
+            try:
+                translation = local.translate_batch([text], target_language)[0]
+                logger.debug("Translation complete (local)")
+                self._cache.set(key, translation)
+                return translation
+            except Exception as e:
+                logger.warning("Local translation error, using Gemini: %s", e)
+        
+        prompt = f"""Text: "{text}"
 
 {target_language}:"""
         
         try:
-            response = self.model.generate_content(
+            translation = "".join(_generate_stream(
+                self._model_for(target_language),
                 prompt,
-                generation_config={"temperature": 0.1, "max_output_tokens": 1024}
-            )
-            translation = response.text.strip().strip('"').strip("'")
-            print(f"   Translation complete")
-            time.sleep(20)
+                {"temperature": 0.1, "max_output_tokens": 1024}
+            )).strip().strip('"').strip("'")
+            logger.debug("Translation complete")
+            self._cache.set(key, translation)
             return translation
         except Exception as e:
-            print(f"   Translation error: {e}")
+            logger.warning("Translation error: %s", e)
             return text
+    
+    def translate_batch(self, texts: list, target_language: str = "English") -> list:
+        """Translate several texts with a single Gemini call.
+        
+        Cached texts are not resent. Falls back to one translate() call per
+        text if the batched reply can't be parsed.
+        """
+        results = [""] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) == 0:
+                continue
+            cached = self._cache.get(_text_key(text, target_language))
+            if cached is not None:
+                results[i] = cached
+            elif len(text) > TRANSLATE_CHUNK_CHARS:
+                # Too long for one batch slot; translate() chunks it
+                results[i] = self.translate(text, target_language)
+            else:
+                pending.append(i)
+        
+        local = _get_local_translator()
+        if local is not None:
+            local_pending = [i for i in pending if local.supports(texts[i], target_language)]
+            if local_pending:
+                logger.debug("Translating %s texts to %s locally...", len(local_pending), target_language)
+                try:
+                    translations = local.translate_batch([texts[i] for i in local_pending], target_language)
+                    for i, translation in zip(local_pending, translations):
+                        results[i] = translation
+                        self._cache.set(_text_key(texts[i], target_language), translation)
+                    done = set(local_pending)
+                    pending = [i for i in pending if i not in done]
+                except Exception as e:
+                    logger.warning("Local translation error, using Gemini: %s", e)
+        
+        if len(pending) <= 1:
+            for i in pending:
+                results[i] = self.translate(texts[i], target_language)
+            return results
+        
+        logger.debug("Translating %s texts to %s in one call...", len(pending), target_language)
+        
+        try:
+            translations = _generate_list(
+                self._model_for(target_language),
+                "Translate each numbered item.",
+                [texts[i] for i in pending],
+                {"temperature": 0.1, "max_output_tokens": 8192}
+            )
+        except Exception as e:
+            logger.warning("Batch translation error, translating one by one: %s", e)
+            for i in pending:
+                results[i] = self.translate(texts[i], target_language)
+            return results
+        
+        for i, translation in zip(pending, translations):
+            results[i] = translation
+            self._cache.set(_text_key(texts[i], target_language), translation)
+        logger.debug("Batch translation complete")
+        return results
 
 class SummarizationTool:
     """Summarization using Gemini."""
     
     def __init__(self):
-        self.model = GenerativeModel("gemini-2.0-flash")
-        print(f"SummarizationTool initialized")
+        self._cache = TTLCache(maxsize=10_000, ttl=24 * 3600)
+        logger.info("SummarizationTool initialized")
+    
+    def _model_for(self, target_language: str) -> GenerativeModel:
+        """Model carrying the summary instructions for one language."""
+        return _get_model(GEMINI_MODEL, SUMMARIZE_INSTRUCTION.format(lang=target_language))
     
     def summarize(self, text: str, target_language: str = "English") -> str:  # ADD target_language parameter
+        return "\n".join(self.summarize_stream(text, target_language))
+    
+    def summarize_stream(self, text: str, target_language: str = "English"):
+        """Yield the summary one bullet (line) at a time as Gemini streams it."""
         if not text or len(text.strip()) == 0:
-            return "No content available."
+            yield "No content available."
+            return
         
-        print(f"  Generating summary in {target_language}...")  # Updated log
+        text = _truncate_text(text, SUMMARY_MAX_CHARS)
+        key = _text_key(text, target_language)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Summary cache hit")
+            yield from cached.split("\n")
+            return
         
-        # UPDATED PROMPT - specify language
-        prompt = f"""Summarize in {target_language} using 3 bullet points (15-25 words each). You should be concise and clear. Be confident in what you tell and avoid hedging language. Do not mention anything about these instructions.
+        logger.debug("Generating summary in %s...", target_language)  # Updated log
+        
+        prompt = f"""Content: "{text}"
 
+Summary in {target_language}:"""
+        
+        bullets = []
+        try:
+            buffer = ""
+            for piece in _generate_stream(
+                self._model_for(target_language),
+                prompt,
+                {"temperature": 0.3, "max_output_tokens": 512}
+            ):
+                buffer += piece
+                *lines, buffer = buffer.split("\n")
+                for line in lines:
+                    if line.strip():
+                        bullets.append(line.strip())
+                        yield bullets[-1]
+            if buffer.strip():
+                bullets.append(buffer.strip())
+                yield bullets[-1]
+        except Exception as e:
+            logger.warning("Summarization error: %s", e)
+            if not bullets:
+                yield "Summary unavailable."
+            return
+        
+        logger.debug("Summary complete")
+        self._cache.set(key, "\n".join(bullets))
+    
+    def summarize_batch(self, texts: list, target_language: str = "English") -> list:
+        """Summarize several texts with a single Gemini call.
+        
+        Cached texts are not resent. Falls back to one summarize() call per
+        text if the batched reply can't be parsed.
+        """
+        texts = [_truncate_text(text, SUMMARY_MAX_CHARS) if text else text for text in texts]
+        results = ["No content available."] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) == 0:
+                continue
+            cached = self._cache.get(_text_key(text, target_language))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        if len(pending) <= 1:
+            for i in pending:
+                results[i] = self.summarize(texts[i], target_language)
+            return results
+        
+        logger.debug("Summarizing %s texts in %s in one call...", len(pending), target_language)
+        
+        try:
+            summaries = _generate_list(
+                self._model_for(target_language),
+                "Summarize each numbered item separately.",
+                [texts[i] for i in pending],
+                {"temperature": 0.3, "max_output_tokens": 8192}
+            )
+        except Exception as e:
+            logger.warning("Batch summarization error, summarizing one by one: %s", e)
+            for i in pending:
+                results[i] = self.summarize(texts[i], target_language)
+            return results
+        
+        for i, summary in zip(pending, summaries):
+            results[i] = summary
+            self._cache.set(_text_key(texts[i], target_language), summary)
+        logger.debug("Batch summary complete")
+        return results
+    
+    def summarize_translated(self, title: str, text: str, target_language: str = "English"):
+        """Translate `title` and summarize `text` into `target_language`
+        with a single Gemini call.
+        
+        The summary is written straight from the original text, so the
+        text itself never needs translating. Returns (title, summary), or
+        None if the call fails or the reply can't be parsed.
+        """
+        if not text or len(text.strip()) == 0:
+            return None
+        
+        text = _truncate_text(text, SUMMARY_MAX_CHARS)
+        key = ("title+summary",) + _text_key(f"{title}\n{text}", target_language)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Title+summary cache hit")
+            return cached
+        
+        logger.debug("Translating title and summarizing in %s...", target_language)
+        
+        prompt = f"""Title: "{title}"
 Content: "{text}"
 
-Summary in {target_language}:"""
+Respond with a JSON object: "title" in {target_language} and "summary" as newline-separated bullets."""
         
         try:
-            response = self.model.generate_content(
+            gemini_limiter.acquire()
+            response = _get_model(
+                GEMINI_MODEL, TITLE_SUMMARY_INSTRUCTION.format(lang=target_language)
+            ).generate_content(
                 prompt,
-                generation_config={"temperature": 0.3, "max_output_tokens": 512}
+                generation_config={
+                    "temperature": 0.2,
+                    "max_output_tokens": 768,
+                    "response_mime_type": "application/json",
+                    "response_schema": TITLE_SUMMARY_SCHEMA
+                }
             )
-            summary = response.text.strip()
-            print(f"  Summary complete")
-            time.sleep(20)
-            return summary
+            data = json_module.loads(response.text)
+            result = (str(data["title"]).strip(), str(data["summary"]).strip())
         except Exception as e:
-            print(f"  Summarization error: {e}")
-            return "Summary unavailable."
+            logger.warning("Title+summary error: %s", e)
+            return None
+        if not result[0] or not result[1]:
+            return None
+        
+        self._cache.set(key, result)
+        return result
@@ -3,11 +3,32 @@ bharat_agent.py - Bharat Connect Cross-Language AI Agent
 =========================================================
 """
 
-import vertexai
-from agents.agent_tools import BigQuerySearchTool, TranslationTool, SummarizationTool
+from agents.agent_tools import (BigQuerySearchTool, TranslationTool, SummarizationTool, init_vertexai,
+                                get_bigquery_client, keep_warm, stop_keep_warm, dominant_script,
+                                _truncate_text)
 import json
+import hashlib
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from datetime import datetime
 
+try:
+    import redis
+except ImportError:
+    # Shared cache is optional; the tools' in-process caches still apply
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Translations/summaries shared across processes and users for a day
+SHARED_CACHE_TTL = 86400
+
+# Articles processed concurrently per query
+ARTICLE_WORKERS = 8
+
 LANGUAGE_MAP = {
     'Hindi': 'hi',
     'English': 'en',
@@ -21,55 +42,279 @@ LANGUAGE_MAP = {
     'Punjabi': 'pa'
 }
 
-LANGUAGE_NAMES = {
-    'hi': 'Hindi',
-    'en': 'English',
-    'te': 'Telugu',
-    'ta': 'Tamil',
-    'mr': 'Marathi',
-    'gu': 'Gujarati',
-    'kn': 'Kannada',
-    'ml': 'Malayalam',
-    'bn': 'Bengali',
-    'pa': 'Punjabi'
+# Reverse of LANGUAGE_MAP, derived so the two can't drift apart
+LANGUAGE_NAMES = {code: name for name, code in LANGUAGE_MAP.items()}
+
+# Unicode script -> language codes written in it
+SCRIPT_LANGUAGES = {
+    'LATIN': ('en',),
+    'DEVANAGARI': ('hi', 'mr'),
+    'TELUGU': ('te',),
+    'TAMIL': ('ta',),
+    'GUJARATI': ('gu',),
+    'KANNADA': ('kn',),
+    'MALAYALAM': ('ml',),
+    'BENGALI': ('bn',),
+    'GURMUKHI': ('pa',)
 }
 
+def detect_languages(text: str) -> tuple:
+    """Candidate language codes for `text` from its dominant script.
+    
+    Every supported language has its own script except Hindi/Marathi
+    (both Devanagari), so the script alone is a cheap, local language ID.
+    Returns () when there are no letters to go on.
+    """
+    return SCRIPT_LANGUAGES.get(dominant_script(text), ())
+
+def join_field(value) -> str:
+    """Display string for a DIKSHA field that may be a list or a scalar."""
+    if isinstance(value, list):
+        return ', '.join(map(str, value))
+    return str(value)
+
+def dedupe_results(results: list, limit: int) -> list:
+    """First `limit` results with duplicate stories dropped.
+    
+    Rows are the same story when they share a URL or a title (ignoring
+    case and whitespace); the earlier, higher-ranked row is kept.
+    """
+    seen = set()
+    unique = []
+    for article in results:
+        keys = {" ".join(str(article.get('title') or '').casefold().split())}
+        if article.get('url'):
+            keys.add(article['url'])
+        keys.discard('')
+        if keys & seen:
+            continue
+        seen |= keys
+        unique.append(article)
+        if len(unique) == limit:
+            break
+    return unique
+
 class BharatConnectAgent:
     """Cross-language intelligent agent."""
     
-    def __init__(self, project_id: str, location: str, user_language: str = "English"):
-        print(f"Initializing Bharat Connect Agent...")
-        print(f"   Project: {project_id}")
-        print(f"   Location: {location}")
-        print(f"   User Language: {user_language}")
+    def __init__(self, project_id: str, location: str, user_language: str = "English",
+                 credentials=None):
+        logger.info("Initializing Bharat Connect Agent (project=%s, location=%s, language=%s)",
+                    project_id, location, user_language)
         
-        vertexai.init(project=project_id, location=location)
+        # Vertex AI and BigQuery share one set of credentials; both are
+        # set up once per process and reused by every agent
+        init_vertexai(project_id, location, credentials=credentials)
         
         self.user_language = user_language
         self.user_language_code = LANGUAGE_MAP.get(user_language, 'en')
         
-        self.searcher = BigQuerySearchTool(project_id)
-        self.translator = TranslationTool()
-        self.summarizer = SummarizationTool()
+        self.searcher = BigQuerySearchTool(project_id, client=get_bigquery_client(project_id, credentials))
+        self._pool = ThreadPoolExecutor(max_workers=ARTICLE_WORKERS)
+        
+        self._redis = None
+        redis_url = os.getenv("REDIS_URL")
+        if redis is not None and redis_url:
+            try:
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=1)
+                self._redis.ping()
+                logger.info("Shared cache: %s", redis_url)
+            except Exception as e:
+                logger.warning("Shared cache unavailable: %s", e)
+                self._redis = None
+        
+        # Held weakly: pings stop once no agent is left, or after a long
+        # idle spell (process_query renews them)
+        keep_warm(self)
+        
+        logger.info("Agent ready for %s (code: %s)", user_language, self.user_language_code)
+    
+    def close(self):
+        """Stop keepalive pings for this agent and release its worker threads."""
+        stop_keep_warm(self)
+        self._pool.shutdown(wait=False)
+    
+    # Gemini tools are built on first use, so agents that never run a
+    # query (e.g. created for a language the user switches away from)
+    # don't pay for them
+    @cached_property
+    def translator(self) -> TranslationTool:
+        return TranslationTool()
+    
+    @cached_property
+    def summarizer(self) -> SummarizationTool:
+        return SummarizationTool()
+    
+    def _shared_cached(self, prefix: str, fn, text: str, target_language: str, failed: set) -> str:
+        """Call `fn(text, target_language=...)` through the Redis cache.
+        
+        Results in `failed` (the tools' fallback values) are not stored.
+        """
+        if self._redis is None or not text:
+            return fn(text, target_language=target_language)
+        
+        key = f"{prefix}:{target_language}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+        try:
+            cached = self._redis.get(key)
+            if cached is not None:
+                return cached.decode("utf-8")
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+        
+        result = fn(text, target_language=target_language)
+        if result not in failed:
+            try:
+                self._redis.set(key, result.encode("utf-8"), ex=SHARED_CACHE_TTL)
+            except Exception as e:
+                logger.warning("Shared cache write failed: %s", e)
+        return result
+    
+    def _cached_summarize(self, text: str, target_language: str) -> str:
+        return self._shared_cached("sm", self.summarizer.summarize, text, target_language,
+                                   {"Summary unavailable.", "No content available."})
+    
+    def _summarize_translated(self, title: str, content: str) -> tuple:
+        """(translated title, summary) for a foreign-language article.
+        
+        One fused Gemini call through the Redis cache; falls back to a
+        separate translate and summarize if the fused reply is unusable.
+        """
+        key = None
+        if self._redis is not None:
+            digest = hashlib.sha1(f"{title}\n{content}".encode('utf-8')).hexdigest()
+            key = f"ts:{self.user_language}:{digest}"
+            try:
+                cached = self._redis.get(key)
+                if cached is not None:
+                    return tuple(json.loads(cached))
+            except Exception as e:
+                logger.warning("Shared cache read failed: %s", e)
+        
+        result = self.summarizer.summarize_translated(title, content, self.user_language)
+        if result is None:
+            return (self._cached_translate_batch([title], self.user_language)[0],
+                    self._cached_summarize(content, self.user_language))
+        
+        if key is not None:
+            try:
+                self._redis.set(key, json.dumps(result, ensure_ascii=False).encode('utf-8'),
+                                ex=SHARED_CACHE_TTL)
+            except Exception as e:
+                logger.warning("Shared cache write failed: %s", e)
+        return result
+    
+    @staticmethod
+    def _language_code(article: dict) -> str:
+        """Article language code; DIKSHA rows carry a list of codes."""
+        # FIXED: Handle language as list or string
+        original_lang_raw = article.get('language', 'en')
+        
+        if isinstance(original_lang_raw, list):
+            original_lang_raw = original_lang_raw[0] if original_lang_raw else 'en'
+        # Row values are fresh strings; interning makes the comparisons and
+        # LANGUAGE_NAMES lookups against the (interned) literal codes hit
+        # the identity fast path
+        return sys.intern(original_lang_raw) if isinstance(original_lang_raw, str) else original_lang_raw
+    
+    @staticmethod
+    def _article_content(article: dict) -> str:
+        """Text to translate and summarize for an article (max 500 chars).
+        
+        Whitespace runs are collapsed first, and the cut lands on a
+        sentence end (including the danda) or word break where possible,
+        never inside a grapheme cluster.
+        """
+        content = article.get('description', '') or article.get('content', '') or article.get('title', 'No title')
+        content = " ".join(content.split())
+        return _truncate_text(content, 500)
+    
+    def _needs_translation(self, lang_code: str, title: str) -> bool:
+        """Whether an article must be translated into the user's language.
+        
+        Trusts the article's language label, except when the title is
+        unambiguously written in the user's script (mislabeled rows).
+        """
+        if lang_code == self.user_language_code:
+            return False
+        return detect_languages(title) != (self.user_language_code,)
+    
+    def _cached_translate_batch(self, texts: list, target_language: str) -> list:
+        """translate_batch() through the Redis cache: only misses are sent."""
+        if self._redis is None:
+            return self.translator.translate_batch(texts, target_language)
+        
+        results = list(texts)
+        misses = [i for i, text in enumerate(texts) if text]
+        keys = {i: f"tr:{target_language}:{hashlib.sha1(texts[i].encode('utf-8')).hexdigest()}" for i in misses}
+        try:
+            values = self._redis.mget([keys[i] for i in misses]) if misses else []
+            hits = {i: v.decode("utf-8") for i, v in zip(misses, values) if v is not None}
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            hits = {}
+        for i, value in hits.items():
+            results[i] = value
+        misses = [i for i in misses if i not in hits]
+        
+        if misses:
+            translated = self.translator.translate_batch([texts[i] for i in misses], target_language)
+            try:
+                pipe = self._redis.pipeline()
+                for i, translation in zip(misses, translated):
+                    results[i] = translation
+                    # translate() returns the input unchanged on error
+                    if translation != texts[i]:
+                        pipe.set(keys[i], translation.encode("utf-8"), ex=SHARED_CACHE_TTL)
+                pipe.execute()
+            except Exception as e:
+                logger.warning("Shared cache write failed: %s", e)
+        return results
+    
+    @staticmethod
+    def _build_result(article: dict, title: str, original_title: str, lang_code: str,
+                      was_translated: bool, summary: str) -> dict:
+        """Display dict for one processed search result."""
+        # Determine content type
+        source = article.get('source', 'unknown').lower()
+        content_type_determined = 'education' if 'diksha' in source else 'news'
+        
+        # Build result
+        result = {
+            "title": title,
+            "original_title": original_title,
+            "original_language": LANGUAGE_NAMES.get(lang_code, 'Unknown'),
+            "original_language_code": lang_code,
+            "was_translated": was_translated,
+            "summary": summary,
+            "source": article.get('source', 'Unknown'),
+            "url": article.get('url', article.get('diksha_url', '#')),
+            "date": str(article.get('published_date', article.get('created_on', 'N/A'))),
+            "content_type": content_type_determined
+        }
         
-        print(f"Agent ready for {user_language} (code: {self.user_language_code})")
+        # Add education fields
+        if content_type_determined == 'education':
+            result.update({
+                "board": article.get('board', 'N/A'),
+                "grade": join_field(article.get('grade_level', [])),
+                "subject": join_field(article.get('subject', []))
+            })
+        return result
     
     def process_query(self, query: str, filters: dict = None) -> dict:
         """Process user query with cross-language search."""
-        print(f"\n{'='*70}")
-        print(f"PROCESSING QUERY")
-        print(f"{'='*70}")
-        print(f"Query: {query}")
-        print(f"User Language: {self.user_language} ({self.user_language_code})")
-        print(f"Filters: {filters}")
-        print(f"{'='*70}\n")
+        logger.debug("Processing query %r for %s (%s), filters=%s",
+                     query, self.user_language, self.user_language_code, filters)
         
+        # Renew keepalive pings, which stop after a long idle spell
+        keep_warm(self)
         filters = filters or {}
+        query_languages = detect_languages(query)
         limit = filters.get('limit', 5)
         content_type = filters.get('content_type', 'All')
         
         # STEP 1: Try user's language first
-        print(f"Step 1: Searching in {self.user_language}...")
+        logger.debug("Step 1: searching in %s", self.user_language)
         
         results = self.searcher.search(
             query,
@@ -81,29 +326,32 @@ class BharatConnectAgent:
         
         # STEP 2: If no results, try all languages
         if not results or len(results) == 0:
-            print(f"  No results in {self.user_language}")
-            print(f"Step 2: Searching in ALL languages...")
+            logger.debug("Step 2: no results in %s, searching in all languages", self.user_language)
             
-            # Try both original query and English translation
-            queries_to_try = [query]
+            # Start the original-query search now and translate the query
+            # while it runs; both variants then search concurrently
+            searches = [self._pool.submit(self.searcher.search, query, limit=limit * 2, languages=None)]
             
-            if self.user_language_code != 'en':
+            # Only translate when the query isn't already English (e.g. a
+            # Telugu user typing "Class 10 Mathematics")
+            if self.user_language_code != 'en' and 'en' not in query_languages:
                 try:
                     translated_query = self.translator.translate(query, target_language="English")
-                    print(f"  Translated: {query} → {translated_query}")
-                    queries_to_try.append(translated_query)
+                    logger.debug("Translated query: %r -> %r", query, translated_query)
+                    if translated_query and translated_query != query:
+                        searches.append(
+                            self._pool.submit(self.searcher.search, translated_query, limit=limit * 2, languages=None)
+                        )
                 except Exception as e:
-                    print(f"  Translation failed: {e}")
+                    logger.warning("Query translation failed: %s", e)
             
-            # Search with all query variants
-            for q in queries_to_try:
-                results = self.searcher.search(
-                    q,
-                    limit=limit * 2,
-                    languages=None
-                )
+            # Prefer the original query's results; fall back to the translation's
+            for future in searches:
+                results = future.result()
                 if results and len(results) > 0:
                     break  # Stop on first successful search
+            for future in searches:
+                future.cancel()
             
             cross_language_used = True
         
@@ -119,88 +367,38 @@ class BharatConnectAgent:
             }
         
         # STEP 4: Process and translate results
-        print(f"\nStep 3: Processing {len(results)} results...")
+        logger.debug("Step 3: processing %d results", len(results))
         
-        processed_results = []
+        # Work column-wise: pull each field out once, decide and translate
+        # in bulk, and only build per-article dicts at the end
+        # Duplicates would each cost a Gemini call; drop them before any work
+        articles = dedupe_results(results, limit)
+        original_titles = [article.get('title', 'No title') for article in articles]
+        lang_codes = [self._language_code(article) for article in articles]
+        contents = [self._article_content(article) for article in articles]
+        needs_translation = [
+            self._needs_translation(code, title) for code, title in zip(lang_codes, original_titles)
+        ]
         
-        for idx, article in enumerate(results[:limit], 1):
-            print(f"\n   [{idx}/{min(limit, len(results))}] Processing article...")
-            
-            # FIXED: Handle language as list or string
-            original_lang_raw = article.get('language', 'en')
-            
-            if isinstance(original_lang_raw, list):
-                original_lang_code = original_lang_raw[0] if original_lang_raw else 'en'
-            else:
-                original_lang_code = original_lang_raw
-            
-            original_lang_name = LANGUAGE_NAMES.get(original_lang_code, 'Unknown')
-            
-            print(f"      Original Language: {original_lang_name} ({original_lang_code})")
-            
-            needs_translation = True # to force quality assurance
-            
-            # Get title
-            original_title = article.get('title', 'No title')
-            title = original_title
-            
-            if needs_translation:
-                print(f"      Translating title to {self.user_language}...")
-                title = self.translator.translate(original_title, target_language=self.user_language)
-            
-            # Get content
-            content = article.get('description', '') or article.get('content', '') or original_title
-            
-            if len(content) > 500:
-                content = content[:500]
-            
-            if needs_translation:
-                print(f"      Translating content to {self.user_language}...")
-                content = self.translator.translate(content, target_language=self.user_language)
-            
-            # Summarize
-            print(f"      Generating summary...")
-            summary = self.summarizer.summarize(content, target_language=self.user_language)  # ADD target_language
-            
-            # Determine content type
-            source = article.get('source', 'unknown').lower()
-            content_type_determined = 'education' if 'diksha' in source else 'news'
-            
-            # Build result
-            result = {
-                "title": title,
-                "original_title": original_title,
-                "original_language": original_lang_name,
-                "original_language_code": original_lang_code,
-                "was_translated": needs_translation,
-                "summary": summary,
-                "source": article.get('source', 'Unknown'),
-                "url": article.get('url', article.get('diksha_url', '#')),
-                "date": str(article.get('published_date', article.get('created_on', 'N/A'))),
-                "content_type": content_type_determined
-            }
-            
-            # Add education fields
-            if content_type_determined == 'education':
-                grade_level = article.get('grade_level', [])
-                subject = article.get('subject', [])
-                
-                result.update({
-                    "board": article.get('board', 'N/A'),
-                    "grade": ', '.join(grade_level) if isinstance(grade_level, list) else str(grade_level),
-                    "subject": ', '.join(subject) if isinstance(subject, list) else str(subject)
-                })
-            
-            processed_results.append(result)
-            print(f"      Done")
+        # One Gemini call per article, run concurrently: foreign articles
+        # get their title translated and a summary written in the user's
+        # language together; the content itself is never translated
+        def title_and_summary(i):
+            if needs_translation[i]:
+                return self._summarize_translated(original_titles[i], contents[i])
+            return original_titles[i], self._cached_summarize(contents[i], self.user_language)
+        
+        logger.debug("Summarizing %d results (%d translated)", len(articles), sum(needs_translation))
+        titles, summaries = zip(*self._pool.map(title_and_summary, range(len(articles))))
+        
+        processed_results = [
+            self._build_result(*row)
+            for row in zip(articles, titles, original_titles, lang_codes, needs_translation, summaries)
+        ]
         
         # STEP 5: Return results
-        print(f"\n{'='*70}")
-        print(f"QUERY COMPLETE")
-        print(f"{'='*70}")
-        print(f"Results: {len(processed_results)}")
-        print(f"Cross-language: {cross_language_used}")
-        print(f"{'='*70}\n")
+        logger.debug("Query complete: %d results, cross-language=%s",
+                     len(processed_results), cross_language_used)
         
         return {
             "query": query,
@@ -15,13 +15,26 @@ This is the main entry point that orchestrates:
 
 from intelligent_feed_agent import UltimateAIScraper
 from rag_agent import RAGAgent
-from validator_agent import ValidatorAgent
+from validator_agent import ValidatorAgent, pooled_session
 from learning_agent import LearningAgent
+import heapq
+import itertools
 import json
 import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
-import uuid
+from urllib.parse import urlparse
+import secrets
+
+try:
+    import orjson
+except ImportError:
+    # Optional C serializer; stdlib json is used without it
+    orjson = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,6 +43,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _banner(*lines: str):
+    """Print console banners only for interactive runs (or BC_VERBOSE=1);
+    scheduled jobs keep their logs without the decoration"""
+    if sys.stdout.isatty() or os.environ.get("BC_VERBOSE"):
+        print("\n".join(lines))
+
+
+@lru_cache(maxsize=1024)
+def _domain(url: str) -> str:
+    """Network location of a URL (memoized; the same base URL is asked for every iteration)."""
+    return urlparse(url).netloc
+
+
 class CoordinatorAgent:
     """
     Main orchestrator for multi-agent RSS feed discovery system.
@@ -60,13 +86,18 @@ class CoordinatorAgent:
         self.base_url = base_url
         self.max_iterations = max_iterations
         self.min_quality_score = min_quality_score
-        self.run_id = str(uuid.uuid4())  # Unique ID for this discovery run
+        self.run_id = secrets.token_hex(16)  # Unique ID for this discovery run (128 random bits)
+        
+        # One keep-alive pool for every validator, so Phase 1 and the RAG
+        # iterations reuse connections to the same hosts. Released by close().
+        self._http = pooled_session(pool_size=64)
         
         # Initialize all agents
         self.intelligent_agent = UltimateAIScraper(project_id)
-        self.rag_agent = RAGAgent(project_id, base_url)
+        self.rag_agent = RAGAgent(project_id, base_url, session=self._http)
         # AIValidatorAgent requires project_id as first argument; pass through for compatibility
-        self.validator_agent = ValidatorAgent(project_id=project_id, min_quality_score=min_quality_score, timeout=10)
+        self.validator_agent = ValidatorAgent(project_id=project_id, min_quality_score=min_quality_score,
+                                              timeout=10, session=self._http)
         self.learning_agent = LearningAgent()
         
         # State tracking
@@ -74,11 +105,23 @@ class CoordinatorAgent:
         self.validated_feeds = []
         self.start_time = None
         self.phase_results = {}
+        # Output of the last _phase_final_analysis(), reused by get/save_results
+        self._final_results: Optional[Dict] = None
         
-        logger.info(f"CoordinatorAgent initialized (run_id: {self.run_id})")
-        logger.info(f"   Project: {project_id}")
-        logger.info(f"   Base URL: {base_url}")
-        logger.info(f"   Max iterations: {max_iterations}")
+        logger.info("CoordinatorAgent initialized (run_id: %s)", self.run_id)
+        logger.info("   Project: %s", project_id)
+        logger.info("   Base URL: %s", base_url)
+        logger.info("   Max iterations: %s", max_iterations)
+    
+    def close(self):
+        """Release the HTTP connection pool shared with the RAG and validator agents."""
+        self._http.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def execute_discovery(self, start_url: str) -> Dict:
         """
@@ -94,24 +137,21 @@ class CoordinatorAgent:
         
         self.start_time = datetime.now()
         
-        print("\n" + "="*100)
-        print("STARTING MULTI-AGENT RSS FEED DISCOVERY WORKFLOW")
-        print("="*100 + "\n")
+        _banner("\n" + "="*100,
+                "STARTING MULTI-AGENT RSS FEED DISCOVERY WORKFLOW",
+                "="*100 + "\n")
         
         try:
             # PHASE 1: Initial Heuristic Discovery
-            print("PHASE 1: Initial Heuristic Discovery")
-            print("-"*100)
+            _banner("PHASE 1: Initial Heuristic Discovery", "-"*100)
             self._phase_1_initial_discovery(start_url)
             
             # PHASE 2-N: RAG Learning Iterations
-            print("\nPHASE 2+: RAG Learning & Validation Iterations")
-            print("-"*100)
+            _banner("\nPHASE 2+: RAG Learning & Validation Iterations", "-"*100)
             self._phase_2_rag_iterations()
             
             # PHASE FINAL: Analysis & Compilation
-            print("\nPHASE FINAL: Analysis & Results Compilation")
-            print("-"*100)
+            _banner("\nPHASE FINAL: Analysis & Results Compilation", "-"*100)
             results = self._phase_final_analysis()
             
             # Print summary
@@ -120,7 +160,7 @@ class CoordinatorAgent:
             return results
         
         except Exception as e:
-            logger.error(f"Discovery workflow failed: {e}", exc_info=True)
+            logger.error("Discovery workflow failed: %s", e, exc_info=True)
             raise
     
     def _phase_1_initial_discovery(self, start_url: str):
@@ -136,7 +176,7 @@ class CoordinatorAgent:
             # Run intelligent discovery
             initial_feeds = self.intelligent_agent.discover(start_url, max_pages=500)
 
-            logger.info(f"   Found {len(initial_feeds)} feeds via heuristics")
+            logger.info("   Found %s feeds via heuristics", len(initial_feeds))
             
             if not initial_feeds:
                 logger.warning("No initial feeds discovered!")
@@ -148,11 +188,11 @@ class CoordinatorAgent:
                 return
             
             # Validate all initial feeds
-            logger.info(f"   Validating {len(initial_feeds)} feeds...")
+            logger.info("   Validating %s feeds...", len(initial_feeds))
             validation_results = self.validator_agent.validate_batch(initial_feeds, source='phase1', run_id=self.run_id)
             
             validated_count = validation_results["valid_count"]
-            logger.info(f"   {validated_count} feeds passed validation")
+            logger.info("   %s feeds passed validation", validated_count)
             
             # Add to main list
             self.all_discovered_feeds.extend(validation_results["validated_feeds"])
@@ -166,7 +206,7 @@ class CoordinatorAgent:
             }
         
         except Exception as e:
-            logger.error(f"Phase 1 failed: {e}")
+            logger.error("Phase 1 failed: %s", e)
             raise
     
     def _phase_2_rag_iterations(self):
@@ -188,27 +228,90 @@ class CoordinatorAgent:
             self.rag_agent.run_id = self.run_id
         except Exception:
             pass
+        
+        # Pattern learning + candidate generation (a Gemini call) for the
+        # next iteration runs in the background while this iteration's
+        # candidates are validated. It only depends on the seed feeds, so
+        # nothing is lost by starting it early.
+        prepare_pool = ThreadPoolExecutor(max_workers=1)
+        pending = None
+        try:
+            pending = self._run_rag_iterations(prepare_pool)
+        finally:
+            prepare_pool.shutdown(wait=False, cancel_futures=True)
+        
+        # An early stop can leave the next iteration's preparation queued or
+        # running. A running one can't be interrupted: wait for it so it
+        # doesn't change patterns/stats during final analysis, then undo it.
+        if pending is not None:
+            future, last_patterns = pending
+            if not future.cancelled():
+                try:
+                    prepared = future.result()
+                except Exception:
+                    prepared = None
+                self.rag_agent.discard_prepared(prepared, last_patterns)
+        
+        # Update all feeds with latest discoveries
+        self.all_discovered_feeds = self.rag_agent.discovered_feeds
+    
+    def _run_rag_iterations(self, prepare_pool: ThreadPoolExecutor):
+        """Iteration loop of Phase 2, fed by pipelined prepare_iteration() calls.
+        
+        Returns:
+            (future, patterns) if the loop stopped with a preparation still
+            pending, where patterns are those of the last iteration run;
+            otherwise None
+        """
+        prepare = lambda: self.rag_agent.prepare_iteration(self.validated_feeds, "hybrid", 50)
+        last_patterns = self.rag_agent.learned_patterns
+        next_prepared = prepare_pool.submit(prepare)
+        pending = None
+        
         for iteration in range(1, self.max_iterations):
-            logger.info(f"\nRAG Iteration {iteration}/{self.max_iterations-1}")
+            logger.info("\nRAG Iteration %s/%s", iteration, self.max_iterations-1)
             logger.info("="*80)
             
+            try:
+                prepared = next_prepared.result()
+            except Exception as e:
+                logger.error("Error preparing iteration %s: %s", iteration, e)
+                prepared = None
+            pending = None
+            
+            # Skip the validation batch entirely when it cannot find anything new
+            should_stop, reason = self.rag_agent.pre_iteration_stop_check(prepared)
+            if should_stop:
+                logger.info("\nConvergence detected before iteration %s: %s", iteration, reason)
+                self.rag_agent.discard_prepared(prepared, last_patterns)
+                break
+            
+            if iteration < self.max_iterations - 1:
+                next_prepared = prepare_pool.submit(prepare)
+                pending = next_prepared
+            
             try:
                 # Run RAG iteration
                 result = self.rag_agent.run_iteration(
                     current_feeds=self.validated_feeds,
                     strategy="hybrid",
-                    num_candidates=50
+                    num_candidates=50,
+                    prepared=prepared
                 )
                 
                 new_feeds_found = result.get("new_feeds_found", 0)
-                logger.info(f"   Found {new_feeds_found} new feeds")
+                logger.info("   Found %s new feeds", new_feeds_found)
+                last_patterns = result.get("patterns") or {}
 
                 # Extract rich validation reports (if provided) and forward to LearningAgent
                 validated_reports = result.get("validated_reports", [])
                 rejected_reports = result.get("rejected_reports", [])
 
-                # Analyze iteration with learning agent (include per-feed reports)
-                if self.rag_agent.learned_patterns:
+                # Analyze iteration with learning agent (include per-feed reports).
+                # Use this iteration's patterns: the agent's may already be
+                # the next iteration's.
+                patterns = result.get("patterns") or {}
+                if patterns:
                     learning_result = self.learning_agent.analyze_iteration(
                         iteration_num=iteration,
                         domain=self._extract_domain(self.base_url),
@@ -216,7 +319,7 @@ class CoordinatorAgent:
                         # number of candidates that were validated (tests performed)
                         candidates_validated=len(validated_reports) if validated_reports is not None else 0,
                         new_feeds_found=new_feeds_found,
-                        patterns=self.rag_agent.learned_patterns,
+                        patterns=patterns,
                         strategy="hybrid",
                         validated_reports=validated_reports,
                         rejected_reports=rejected_reports
@@ -224,26 +327,25 @@ class CoordinatorAgent:
                     
                     # Log insights
                     for insight in learning_result.get("insights", []):
-                        logger.info(f"   {insight}")
+                        logger.info("   %s", insight)
                 
                 # Check convergence
                 should_stop, reason = self.rag_agent.should_stop_iteration()
                 
                 if should_stop:
-                    logger.info(f"\nConvergence detected: {reason}")
+                    logger.info("\nConvergence detected: %s", reason)
                     break
                 
                 if new_feeds_found == 0:
-                    logger.info(f"No new feeds in iteration {iteration}, stopping early")
+                    logger.info("No new feeds in iteration %s, stopping early", iteration)
                     break
             
             except Exception as e:
-                logger.error(f"Error in iteration {iteration}: {e}")
+                logger.error("Error in iteration %s: %s", iteration, e)
                 # Continue to next iteration despite error
                 continue
         
-        # Update all feeds with latest discoveries
-        self.all_discovered_feeds = self.rag_agent.discovered_feeds
+        return (pending, last_patterns) if pending is not None else None
     
     def _phase_final_analysis(self) -> Dict:
         """
@@ -255,13 +357,10 @@ class CoordinatorAgent:
         
         logger.info("Compiling final results...")
         
-        # Get unique feeds: include validated feeds (seed) + any discovered during RAG
+        # Get unique feeds: include validated feeds (seed) + any discovered during RAG.
+        # Single pass over both lists without copying them into one
         unique_feeds = {}
-        combined_sources = []
-        if self.all_discovered_feeds:
-            combined_sources.extend(self.all_discovered_feeds)
-        if self.validated_feeds:
-            combined_sources.extend(self.validated_feeds)
+        combined_sources = itertools.chain(self.all_discovered_feeds or [], self.validated_feeds or [])
 
         for feed in combined_sources:
             url = None
@@ -321,94 +420,106 @@ class CoordinatorAgent:
             "insights": self.learning_agent.insights
         }
         
+        self._final_results = results
         return results
     
     def _print_final_summary(self, results: Dict):
-        """Print final summary in human-readable format."""
-        
-        print("\n" + "="*100)
-        print("DISCOVERY WORKFLOW COMPLETE")
-        print("="*100)
+        """Print final summary in human-readable format (one stdout write)."""
         
         metadata = results["metadata"]
         summary = results["summary"]
         analysis = results["analysis"]
-        
-        print(f"\nMETADATA")
-        print(f"   Run ID: {metadata['run_id']}")
-        print(f"   Duration: {metadata['duration_seconds']:.1f} seconds")
-        print(f"   Start: {metadata['start_time']}")
-        
-        print(f"\nSUMMARY")
-        print(f"   Total Feeds: {summary['total_unique_feeds']}")
-        print(f"   Iterations: {summary['total_iterations']}")
-        print(f"   URLs Tested: {summary['total_urls_tested']}")
-        print(f"   Success Rate: {summary['overall_success_rate']:.1%}")
-        print(f"   Avg Quality: {summary['avg_quality_score']:.1f}/100")
-        
-        print(f"\nCONVERGENCE ANALYSIS")
         convergence = analysis["convergence"]
-        print(f"   Status: {'CONVERGED' if convergence['converging'] else 'ACTIVE'}")
-        print(f"   Reason: {convergence['reason']}")
-        print(f"   Confidence: {convergence['confidence']:.0%}")
-        print(f"   Recommendation: {convergence['recommendation']}")
-        
-        print(f"\nSTRATEGY RECOMMENDATION")
         strategy = analysis["strategy_recommendation"]
-        print(f"   Recommended: {strategy['recommended']}")
-        print(f"   Success Rate: {strategy.get('avg_success_rate', 0):.1%}")
-        print(f"   Efficiency: {strategy.get('avg_efficiency', 0):.1%}")
-        print(f"   Confidence: {strategy['confidence']:.0%}")
         
-        print(f"\nTOP FEEDS (by quality score)")
-        sorted_feeds = sorted(
+        lines = [
+            "\n" + "="*100,
+            "DISCOVERY WORKFLOW COMPLETE",
+            "="*100,
+            "\nMETADATA",
+            f"   Run ID: {metadata['run_id']}",
+            f"   Duration: {metadata['duration_seconds']:.1f} seconds",
+            f"   Start: {metadata['start_time']}",
+            "\nSUMMARY",
+            f"   Total Feeds: {summary['total_unique_feeds']}",
+            f"   Iterations: {summary['total_iterations']}",
+            f"   URLs Tested: {summary['total_urls_tested']}",
+            f"   Success Rate: {summary['overall_success_rate']:.1%}",
+            f"   Avg Quality: {summary['avg_quality_score']:.1f}/100",
+            "\nCONVERGENCE ANALYSIS",
+            f"   Status: {'CONVERGED' if convergence['converging'] else 'ACTIVE'}",
+            f"   Reason: {convergence['reason']}",
+            f"   Confidence: {convergence['confidence']:.0%}",
+            f"   Recommendation: {convergence['recommendation']}",
+            "\nSTRATEGY RECOMMENDATION",
+            f"   Recommended: {strategy['recommended']}",
+            f"   Success Rate: {strategy.get('avg_success_rate', 0):.1%}",
+            f"   Efficiency: {strategy.get('avg_efficiency', 0):.1%}",
+            f"   Confidence: {strategy['confidence']:.0%}",
+            "\nTOP FEEDS (by quality score)",
+        ]
+        
+        # Top 10 only: a bounded heap instead of sorting every feed
+        top_feeds = heapq.nlargest(
+            10,
             results["discovered_feeds"],
-            key=lambda x: x.get("quality_score", 0),
-            reverse=True
+            key=lambda x: x.get("quality_score", 0)
+        )
+        lines.extend(
+            f"   {i:2d}. [{feed.get('quality_score', 0):>3.0f}/100] {feed.get('title', 'Untitled')[:50]}"
+            for i, feed in enumerate(top_feeds, 1)
         )
-        
-        for i, feed in enumerate(sorted_feeds[:10], 1):
-            quality = feed.get("quality_score", 0)
-            title = feed.get("title", "Untitled")[:50]
-            print(f"   {i:2d}. [{quality:>3.0f}/100] {title}")
         
         if len(results["discovered_feeds"]) > 10:
             remaining = len(results["discovered_feeds"]) - 10
-            print(f"   ... and {remaining} more feeds")
+            lines.append(f"   ... and {remaining} more feeds")
         
-        print(f"\nKEY INSIGHTS")
-        for insight in self.learning_agent.insights[:5]:
-            print(f"   - {insight}")
+        lines.append("\nKEY INSIGHTS")
+        lines.extend(f"   - {insight}" for insight in self.learning_agent.insights[:5])
+        lines.append("\n" + "="*100)
         
-        print("\n" + "="*100)
+        sys.stdout.write("\n".join(lines) + "\n")
     
-    def save_results(self, filename: str = "discovery_results.json") -> str:
+    def save_results(self, filename: str = "discovery_results.json", force: bool = False) -> str:
         """
         Save complete discovery results to JSON file.
         
         Args:
             filename: Output filename
+            force: Recompile results even if the final analysis already ran
             
         Returns:
             Filename where results were saved
         """
         
-        results = self._phase_final_analysis()
+        results = self.get_results(force=force)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+        if orjson is not None:
+            # Same layout as json.dump(indent=2, ensure_ascii=False), several times faster
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(results, default=str,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False, default=str)
         
-        logger.info(f"Results saved to {filename}")
+        logger.info("Results saved to %s", filename)
         return filename
     
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL."""
-        from urllib.parse import urlparse
-        return urlparse(url).netloc
+        return _domain(url)
     
-    def get_results(self) -> Dict:
-        """Get current discovery results."""
-        return self._phase_final_analysis()
+    def get_results(self, force: bool = False) -> Dict:
+        """
+        Get current discovery results.
+        
+        Returns the results compiled at the end of execute_discovery();
+        pass force=True to recompile them from the agents' current state.
+        """
+        if force or self._final_results is None:
+            return self._phase_final_analysis()
+        return self._final_results
 
 
 # Example usage
@@ -425,18 +536,17 @@ if __name__ == "__main__":
     MIN_QUALITY_SCORE = 60
     
     # Initialize coordinator
-    coordinator = CoordinatorAgent(
+    with CoordinatorAgent(
         project_id=PROJECT_ID,
         base_url=BASE_URL,
         max_iterations=MAX_ITERATIONS,
         min_quality_score=MIN_QUALITY_SCORE
-    )
-    
-    # Execute discovery
-    results = coordinator.execute_discovery(start_url=START_URL)
-    
-    # Save results
-    coordinator.save_results("discovery_results.json")
+    ) as coordinator:
+        # Execute discovery
+        results = coordinator.execute_discovery(start_url=START_URL)
+        
+        # Save results
+        coordinator.save_results("discovery_results.json")
     
     print(f"\nDiscovery complete!")
     print(f"   Total feeds: {results['summary']['total_unique_feeds']}")
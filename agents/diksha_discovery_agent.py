@@ -10,7 +10,7 @@ Features:
 - Board/Grade/Subject systematic discovery
 - Automatic pagination (500K+ items)
 - BigQuery-ready export format
-- Checkpoint/resume capability
+- Checkpoint/resume capability (SQLite)
 - Progress tracking & statistics
 - Compatible with coordinator.py
 
@@ -26,14 +26,28 @@ Version: 2.0 (Production)
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import csv
 import json
 import time
 import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 import itertools
 import os
+import sqlite3
+import sys
+import threading
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    # Optional C serializer; stdlib json is used without it
+    orjson = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -46,6 +60,10 @@ logger = logging.getLogger(__name__)
 # CONFIGURATION
 # ============================================================================
 
+# Throttled or transient server errors worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
 class DIKSHAConfig:
     """Configuration for DIKSHA API"""
     
@@ -53,30 +71,96 @@ class DIKSHAConfig:
     BASE_URL = "https://diksha.gov.in"
     SEARCH_ENDPOINT = "/api/content/v1/search"  # Works without auth
     
+    # Filter values are immutable tuples of interned strings: they are
+    # reused as dict keys (stats, checkpoint keys) across every combination
+    
     # Supported languages (from PIB + DIKSHA)
-    LANGUAGES = [
+    LANGUAGES = tuple(map(sys.intern, (
         "English", "Hindi", "Tamil", "Telugu", "Marathi",
         "Gujarati", "Kannada", "Malayalam", "Bengali",
         "Punjabi", "Assamese", "Odia", "Urdu"
-    ]
+    )))
     
     # Education boards
-    BOARDS = ["CBSE", "NCERT"]  # Tested working
+    BOARDS = tuple(map(sys.intern, ("CBSE", "NCERT")))  # Tested working
     
     # Grade levels
-    GRADES = [f"Class {i}" for i in range(1, 13)]
+    GRADES = tuple(sys.intern(f"Class {i}") for i in range(1, 13))
     
     # Core subjects
-    SUBJECTS = [
+    SUBJECTS = tuple(map(sys.intern, (
         "Mathematics", "Science", "English", "Hindi",
         "Social Science", "Physics", "Chemistry", "Biology"
-    ]
+    )))
     
     # API settings
     DEFAULT_LIMIT = 100
     REQUEST_TIMEOUT = 15
-    RATE_LIMIT_DELAY = 1.0
-    MAX_RETRIES = 3
+    REQUESTS_PER_SECOND = 10  # sustained rate; bursts up to this many
+    MAX_RETRIES = 3  # retries after the first attempt (429/5xx honour Retry-After)
+    MAX_RETRY_DELAY = 60  # seconds; caps the server's Retry-After
+    
+    # Combinations fetched concurrently; enough in-flight requests to
+    # keep REQUESTS_PER_SECOND busy
+    WORKERS = 16
+    
+    # Shared pool for the pages after the first of each combination
+    PAGE_WORKERS = 8
+    
+    # Keep-alive connections held open to the API host: one per thread that
+    # can be mid-request, so no worker ever opens a throwaway connection
+    # (urllib3 discards connections beyond pool_maxsize after use)
+    POOL_SIZE = WORKERS + PAGE_WORKERS
+
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` requests per second on average,
+    with bursts of up to `rate`. Only blocks when the bucket is empty."""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = rate
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _dumps(obj) -> str:
+    """Compact JSON text, non-ASCII kept as is (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _as_list(value) -> list:
+    """DIKSHA fields are a list, a single value, or missing.
+    (Values come from JSON, so an exact type check is enough.)"""
+    return value if type(value) is list else ([value] if value else [])
+
+
+def _first(value):
+    """First element of a list field, or the value itself."""
+    return value[0] if isinstance(value, list) and value else value
+
+
+# Constant parts of every BigQuery row
+_SOURCE = "DIKSHA"
+_CONTENT_URL_PREFIX = DIKSHAConfig.BASE_URL + "/play/content/"
 
 
 # ============================================================================
@@ -102,6 +186,7 @@ class DIKSHADiscoveryAgent:
         
         # Create checkpoint directory
         os.makedirs(checkpoint_dir, exist_ok=True)
+        self._init_checkpoint_db()
         
         # HTTP headers
         self.headers = {
@@ -110,53 +195,94 @@ class DIKSHADiscoveryAgent:
             "User-Agent": "Mozilla/5.0 (compatible; BharatConnect/1.0)"
         }
         
+        # One session for every request: connections (TCP + TLS) to the API
+        # are kept alive and reused across pages and retries. Retries are
+        # done in _make_request so that each attempt goes through the limiter.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Single host, so one connection pool of POOL_SIZE connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config.POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Paces every API call (pages and retries) instead of fixed sleeps
+        self.limiter = RateLimiter(self.config.REQUESTS_PER_SECOND)
+        self._page_pool = ThreadPoolExecutor(max_workers=self.config.PAGE_WORKERS)
+        
         # Discovery state
-        self.discovered_content = []
+        self.discovered_content = []  # rows already in BigQuery shape (transform_for_bigquery)
+        self._seen_ids = set()  # identifiers in discovered_content
         self.stats = {
             "total_requests": 0,
             "total_discovered": 0,
-            "by_language": defaultdict(int),
-            "by_board": defaultdict(int),
-            "by_grade": defaultdict(int),
-            "by_subject": defaultdict(int)
+            "by_language": Counter(),
+            "by_board": Counter(),
+            "by_grade": Counter(),
+            "by_subject": Counter()
         }
+        self._stats_lock = threading.Lock()
         
         logger.info("DIKSHA Discovery Agent initialized")
         logger.info(f"   Working endpoint: {self.config.SEARCH_ENDPOINT}")
         logger.info(f"   Checkpoint directory: {checkpoint_dir}")
     
+    def close(self):
+        """Release worker threads, pooled HTTP connections and the checkpoint database."""
+        self._page_pool.shutdown(wait=True)
+        self.session.close()
+        with self._db_lock:
+            self._db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    @staticmethod
+    def _retry_delay(response, attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After if the server sent
+        one in seconds (at most MAX_RETRY_DELAY), exponential backoff otherwise."""
+        try:
+            retry_after = float(response.headers.get("Retry-After"))
+            return min(max(0.0, retry_after), DIKSHAConfig.MAX_RETRY_DELAY)
+        except (TypeError, ValueError):
+            return 2 ** attempt
+    
     def _make_request(self, payload: Dict) -> Optional[Dict]:
-        """Make API request with retry logic."""
+        """Make API request with retry logic (every attempt is rate limited)."""
         
         url = f"{self.config.BASE_URL}{self.config.SEARCH_ENDPOINT}"
         
-        for attempt in range(1, self.config.MAX_RETRIES + 1):
+        for attempt in range(self.config.MAX_RETRIES + 1):
             try:
-                response = requests.post(
+                self.limiter.acquire()
+                response = self.session.post(
                     url,
                     json=payload,
-                    headers=self.headers,
                     timeout=self.config.REQUEST_TIMEOUT
                 )
                 
-                self.stats["total_requests"] += 1
+                with self._stats_lock:
+                    self.stats["total_requests"] += 1
                 
                 if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 429:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Rate limit, waiting {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                else:
+                    return _loads(response.content)
+                
+                if response.status_code not in RETRY_STATUSES or attempt == self.config.MAX_RETRIES:
                     logger.error(f"API error {response.status_code}")
                     return None
+                
+                wait_time = self._retry_delay(response, attempt)
+                logger.warning(f"API error {response.status_code}, retrying in {wait_time:.0f}s...")
             
             except Exception as e:
                 logger.error(f"Request error: {e}")
-                if attempt < self.config.MAX_RETRIES:
-                    time.sleep(2 ** attempt)
-                continue
+                if attempt == self.config.MAX_RETRIES:
+                    return None
+                wait_time = 2 ** attempt
+            
+            time.sleep(wait_time)
         
         return None
     
@@ -215,7 +341,7 @@ class DIKSHADiscoveryAgent:
         if response and "result" in response:
             return response["result"]
         
-        return {"count": 0, "content": []}
+        return {"count": 0, "content": [], "error": True}
     
     def discover_with_pagination(self,
                                 board: str,
@@ -236,48 +362,63 @@ class DIKSHADiscoveryAgent:
         Returns:
             List of discovered content
         """
+        return self._paginate(board, grade, subject, medium, max_items)[0]
+    
+    def _paginate(self,
+                  board: str,
+                  grade: str,
+                  subject: str,
+                  medium: Optional[str],
+                  max_items: Optional[int]) -> Tuple[List[Dict], bool]:
+        """
+        Pagination behind discover_with_pagination().
         
-        all_content = []
-        offset = 0
-        page = 1
+        Returns:
+            Tuple of (content, complete); complete is False when a page
+            request failed, so the result must not be checkpointed
+        """
         
-        logger.info(f"Discovering: {board} | {grade} | {subject} | {medium or 'all'}")
+        limit = self.config.DEFAULT_LIMIT
         
-        while True:
-            result = self.search_content(
+        def fetch_page(offset: int) -> Dict:
+            return self.search_content(
                 board=board,
                 grade=grade,
                 subject=subject,
                 medium=medium,
-                limit=100,
+                limit=limit,
                 offset=offset
             )
+        
+        logger.info(f"Discovering: {board} | {grade} | {subject} | {medium or 'all'}")
+        
+        # The first page tells us how many items exist; the remaining pages
+        # are independent offsets, fetched concurrently. Nothing more is
+        # requested when it reports no content.
+        first = fetch_page(0)
+        count = first.get("count", 0)
+        all_content = list(first.get("content", []))
+        complete = not first.get("error")
+        
+        if all_content:
+            logger.info(f"   Page 1: {len(all_content)} items (total available: {count})")
             
-            count = result.get("count", 0)
-            content = result.get("content", [])
-            
-            if not content:
-                break
-            
-            logger.info(f"   Page {page}: {len(content)} items (total available: {count})")
-            
-            all_content.extend(content)
+            target = min(count, max_items) if max_items else count
+            pages = self._page_pool.map(fetch_page, range(limit, target, limit))
+            for page, result in enumerate(pages, 2):
+                content = result.get("content", [])
+                if not content:
+                    complete = not result.get("error")
+                    break
+                logger.info(f"   Page {page}: {len(content)} items (total available: {count})")
+                all_content.extend(content)
             
-            # Check limits
-            if max_items and len(all_content) >= max_items:
+            if max_items:
                 all_content = all_content[:max_items]
-                break
-            
-            if len(all_content) >= count:
-                break
-            
-            offset += 100
-            page += 1
-            time.sleep(self.config.RATE_LIMIT_DELAY)
         
         logger.info(f"   Total discovered: {len(all_content)} items")
         
-        return all_content
+        return all_content, complete
     
     def discover_systematic(self,
                            boards: Optional[List[str]] = None,
@@ -325,52 +466,35 @@ class DIKSHADiscoveryAgent:
             "by_combination": []
         }
         
-        for idx, (board, grade, subject, medium) in enumerate(combinations, 1):
-            logger.info(f"\n[{idx}/{total}] {board} | {grade} | {subject} | {medium or 'all'}")
-            
-            # Check checkpoint
-            checkpoint_key = f"{board}_{grade}_{subject}_{medium or 'all'}"
-            if self._check_checkpoint(checkpoint_key):
-                logger.info("   Skipping (checkpoint exists)")
-                continue
-            
-            content = self.discover_with_pagination(
-                board=board,
-                grade=grade,
-                subject=subject,
-                medium=medium,
-                max_items=items_per_combination
+        # Workers fetch combinations concurrently (paced by the shared rate
+        # limiter); results are merged here in combination order
+        with ThreadPoolExecutor(max_workers=self.config.WORKERS) as pool:
+            outcomes = pool.map(
+                lambda combo: self._discover_combination(*combo, items_per_combination),
+                combinations
             )
-            
-            if content:
-                report["combinations_with_content"] += 1
-                report["total_content"] += len(content)
-                
-                # Tag content
-                for item in content:
-                    item["discovered_board"] = board
-                    item["discovered_grade"] = grade
-                    item["discovered_subject"] = subject
-                    item["discovered_medium"] = medium
+            for idx, ((board, grade, subject, medium), (content, restored)) in enumerate(
+                    zip(combinations, outcomes), 1):
+                logger.info(f"\n[{idx}/{total}] {board} | {grade} | {subject} | {medium or 'all'}")
                 
-                self.discovered_content.extend(content)
-                
-                # Update stats
-                self._update_stats(content)
+                if restored:
+                    added = self._add_content(content)
+                    logger.info(f"   Skipping (checkpoint exists, {added} items restored)")
+                    continue
                 
-                report["by_combination"].append({
-                    "board": board,
-                    "grade": grade,
-                    "subject": subject,
-                    "medium": medium,
-                    "count": len(content)
-                })
+                if content:
+                    report["combinations_with_content"] += 1
+                    report["total_content"] += self._add_content(content)
+                    
+                    report["by_combination"].append({
+                        "board": board,
+                        "grade": grade,
+                        "subject": subject,
+                        "medium": medium,
+                        "count": len(content)
+                    })
                 
-                # Save checkpoint
-                self._save_checkpoint(checkpoint_key)
-            
-            report["combinations_tested"] += 1
-            time.sleep(self.config.RATE_LIMIT_DELAY)
+                report["combinations_tested"] += 1
         
         self.stats["total_discovered"] = len(self.discovered_content)
         
@@ -382,130 +506,254 @@ class DIKSHADiscoveryAgent:
         
         return report
     
-    def _update_stats(self, content: List[Dict]):
-        """Update discovery statistics."""
+    def _discover_combination(self,
+                              board: str,
+                              grade: str,
+                              subject: str,
+                              medium: Optional[str],
+                              max_items: int) -> Tuple[List[Dict], bool]:
+        """
+        Fetch (or restore from checkpoint) one combination's content.
+        Runs on a worker thread.
+        
+        Returns:
+            Tuple of (content, restored_from_checkpoint)
+        """
+        # Check checkpoint: reload its items instead of re-fetching them
+        checkpoint_key = f"{board}_{grade}_{subject}_{medium or 'all'}"
+        if self._check_checkpoint(checkpoint_key):
+            return self._load_checkpoint(checkpoint_key), True
+        
+        content, complete = self._paginate(board, grade, subject, medium, max_items)
+        
+        # Tag content
         for item in content:
-            # Language
-            languages = item.get("language", [])
-            if isinstance(languages, list):
-                for lang in languages:
-                    self.stats["by_language"][lang] += 1
-            elif languages:
-                self.stats["by_language"][languages] += 1
-            
-            # Board
-            board = item.get("board")
-            if isinstance(board, list) and board:
-                board = board[0]
-            if board:
-                self.stats["by_board"][board] += 1
-            
-            # Grade
-            grades = item.get("gradeLevel", [])
-            if isinstance(grades, list):
-                for grade in grades:
-                    self.stats["by_grade"][grade] += 1
-            
-            # Subject
-            subjects = item.get("subject", [])
-            if isinstance(subjects, list):
-                for subj in subjects:
-                    self.stats["by_subject"][subj] += 1
+            item["discovered_board"] = board
+            item["discovered_grade"] = grade
+            item["discovered_subject"] = subject
+            item["discovered_medium"] = medium
+        
+        # Save checkpoint, empty combinations included so a resume doesn't
+        # query them again; failed fetches are left to be retried
+        if complete:
+            self._save_checkpoint(checkpoint_key, content)
+        
+        return content, False
+    
+    def _add_content(self, content: List[Dict]) -> int:
+        """
+        Record a combination's raw API items: stats are counted from the
+        raw fields, and discovered_content keeps only the BigQuery-shaped
+        rows, so exports never transform again.
+        
+        Items already seen under another combination (same identifier)
+        are skipped.
+        
+        Returns:
+            Number of new items added
+        """
+        seen = self._seen_ids
+        new_items = []
+        for item in content:
+            identifier = item.get("identifier")
+            if identifier:
+                if identifier in seen:
+                    continue
+                seen.add(identifier)
+            new_items.append(item)
+        
+        discovered_at = datetime.now().isoformat()
+        self.discovered_content.extend(
+            self.transform_for_bigquery(item, discovered_at=discovered_at) for item in new_items
+        )
+        self._update_stats(new_items)
+        return len(new_items)
+    
+    def _update_stats(self, content: List[Dict]):
+        """Update discovery statistics (one Counter.update per field)."""
+        stats = self.stats
+        stats["by_language"].update(v for item in content for v in _as_list(item.get("language")))
+        # Board is counted once per item, by its first value
+        stats["by_board"].update(v for item in content for v in _as_list(item.get("board"))[:1])
+        stats["by_grade"].update(v for item in content for v in _as_list(item.get("gradeLevel")))
+        stats["by_subject"].update(v for item in content for v in _as_list(item.get("subject")))
+    
+    def _init_checkpoint_db(self):
+        """Open the SQLite checkpoint store (WAL, so each save is a cheap append)."""
+        db_file = os.path.join(self.checkpoint_dir, "diksha_checkpoint.db")
+        self._db = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        try:
+            self._db.execute("PRAGMA journal_mode=WAL;")
+            self._db.execute("PRAGMA synchronous=NORMAL;")
+        except Exception:
+            pass
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS combinations (
+                    key TEXT PRIMARY KEY,
+                    completed_at TEXT NOT NULL,
+                    item_count INTEGER NOT NULL
+                );
+                """
+            )
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    combination TEXT NOT NULL,
+                    identifier TEXT NOT NULL,
+                    item TEXT NOT NULL,
+                    PRIMARY KEY (combination, identifier)
+                );
+                """
+            )
+        # Completed combinations, loaded once so lookups don't touch the db
+        self._completed = {row[0] for row in self._db.execute("SELECT key FROM combinations")}
     
     def _check_checkpoint(self, key: str) -> bool:
         """Check if checkpoint exists."""
-        checkpoint_file = os.path.join(self.checkpoint_dir, f"{key}.json")
-        return os.path.exists(checkpoint_file)
+        return key in self._completed
     
-    def _save_checkpoint(self, key: str):
-        """Save checkpoint."""
-        checkpoint_file = os.path.join(self.checkpoint_dir, f"{key}.json")
-        with open(checkpoint_file, 'w') as f:
-            json.dump({"timestamp": datetime.now().isoformat()}, f)
+    def _load_checkpoint(self, key: str) -> List[Dict]:
+        """Items saved with a combination's checkpoint."""
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT item FROM items WHERE combination = ? ORDER BY rowid", (key,)
+            ).fetchall()
+        # Rows written before compression was added are plain JSON text
+        return [
+            _loads(zlib.decompress(item) if isinstance(item, bytes) else item)
+            for (item,) in rows
+        ]
     
-    def transform_for_bigquery(self, item: Dict) -> Dict:
-        """Transform content item to BigQuery schema."""
+    def _save_checkpoint(self, key: str, content: List[Dict]):
+        """Save checkpoint.
         
-        def extract_first(val):
-            return val[0] if isinstance(val, list) and val else val
+        Writes only this combination's items (one transaction), so the
+        cost per checkpoint doesn't grow with everything discovered so far.
+        Items are stored zlib-compressed.
+        """
+        rows = [
+            (key, str(item.get("identifier") or idx), zlib.compress(_dumps(item).encode("utf-8"), 1))
+            for idx, item in enumerate(content)
+        ]
+        with self._db_lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO items (combination, identifier, item) VALUES (?, ?, ?)", rows
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO combinations (key, completed_at, item_count) VALUES (?, ?, ?)",
+                (key, datetime.now().isoformat(), len(content))
+            )
+        self._completed.add(key)
+    
+    def transform_for_bigquery(self, item: Dict, *, discovered_at: Optional[str] = None) -> Dict:
+        """Transform content item to BigQuery schema.
         
-        def extract_list(val):
-            return val if isinstance(val, list) else ([val] if val else [])
+        Callers transforming a batch pass one `discovered_at` timestamp
+        for all of it; single calls get the current time.
+        """
+        
+        get = item.get
+        identifier = get("identifier")
         
         return {
-            "source": "DIKSHA",
-            "content_id": item.get("identifier"),
-            "title": item.get("name"),
-            "description": item.get("description", ""),
-            "content_type": item.get("contentType"),
-            "primary_category": item.get("primaryCategory"),
-            "mime_type": item.get("mimeType"),
+            "source": _SOURCE,
+            "content_id": identifier,
+            "title": get("name"),
+            "description": get("description", ""),
+            "content_type": get("contentType"),
+            "primary_category": get("primaryCategory"),
+            "mime_type": get("mimeType"),
             
             # Educational
-            "board": extract_first(item.get("board")),
-            "grade_level": extract_list(item.get("gradeLevel")),
-            "subject": extract_list(item.get("subject")),
-            "language": extract_list(item.get("language")),
-            "medium": extract_list(item.get("medium")),
+            "board": _first(get("board")),
+            "grade_level": _as_list(get("gradeLevel")),
+            "subject": _as_list(get("subject")),
+            "language": _as_list(get("language")),
+            "medium": _as_list(get("medium")),
             
             # URLs
-            "diksha_url": f"https://diksha.gov.in/play/content/{item.get('identifier')}",
+            "diksha_url": _CONTENT_URL_PREFIX + str(identifier),
             
             # Metadata
-            "framework": item.get("framework"),
-            "channel": item.get("channel"),
-            "status": item.get("status"),
-            "created_on": item.get("createdOn"),
-            "last_updated_on": item.get("lastUpdatedOn"),
-            "discovered_at": datetime.now().isoformat(),
+            "framework": get("framework"),
+            "channel": get("channel"),
+            "status": get("status"),
+            "created_on": get("createdOn"),
+            "last_updated_on": get("lastUpdatedOn"),
+            "discovered_at": discovered_at or datetime.now().isoformat(),
             
             # Discovery metadata
-            "discovered_board": item.get("discovered_board"),
-            "discovered_grade": item.get("discovered_grade"),
-            "discovered_subject": item.get("discovered_subject"),
-            "discovered_medium": item.get("discovered_medium")
+            "discovered_board": get("discovered_board"),
+            "discovered_grade": get("discovered_grade"),
+            "discovered_subject": get("discovered_subject"),
+            "discovered_medium": get("discovered_medium")
         }
     
     def export_to_json(self, filename: str = "diksha_content.json"):
         """Export to JSON."""
-        
-        export_data = {
-            "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "total_content": len(self.discovered_content),
-                "statistics": dict(self.stats)
-            },
-            "content": [self.transform_for_bigquery(item) for item in self.discovered_content]
-        }
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Exported {len(self.discovered_content)} items to {filename}")
+        self.export_all(json_filename=filename, csv_filename=None)
     
     def export_to_csv(self, filename: str = "diksha_content.csv"):
         """Export to CSV."""
-        import csv
-        
-        if not self.discovered_content:
-            return
+        self.export_all(json_filename=None, csv_filename=filename)
+    
+    def export_all(self,
+                   json_filename: Optional[str] = "diksha_content.json",
+                   csv_filename: Optional[str] = "diksha_content.csv"):
+        """
+        Export JSON and CSV in a single pass over discovered_content (rows
+        are already in BigQuery shape).
         
-        transformed = [self.transform_for_bigquery(item) for item in self.discovered_content]
+        The JSON file is the {"metadata", "content"} document, written one
+        item per line as it is serialized so the transformed corpus is never
+        held in memory. Pass None for either filename to skip that format.
+        """
         
-        with open(filename, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=transformed[0].keys())
-            writer.writeheader()
+        timestamp = datetime.now().isoformat()
+        
+        with ExitStack() as stack:
+            json_file = None
+            if json_filename:
+                json_file = stack.enter_context(open(json_filename, 'w', encoding='utf-8'))
+                metadata = {
+                    "timestamp": timestamp,
+                    "total_content": len(self.discovered_content),
+                    "statistics": dict(self.stats)
+                }
+                json_file.write('{"metadata": ')
+                json_file.write(json.dumps(metadata, indent=2, ensure_ascii=False))
+                json_file.write(',\n"content": [\n')
             
-            for item in transformed:
-                row = {}
-                for k, v in item.items():
-                    if isinstance(v, list):
-                        row[k] = "; ".join(str(x) for x in v)
-                    else:
-                        row[k] = v
-                writer.writerow(row)
+            csv_file = None
+            csv_writer = None
+            if csv_filename and self.discovered_content:
+                csv_file = stack.enter_context(open(csv_filename, 'w', encoding='utf-8', newline=''))
+            
+            for i, transformed in enumerate(self.discovered_content):
+                if json_file:
+                    if i:
+                        json_file.write(",\n")
+                    json_file.write(_dumps(transformed))
+                
+                if csv_file:
+                    if csv_writer is None:
+                        csv_writer = csv.DictWriter(csv_file, fieldnames=transformed.keys())
+                        csv_writer.writeheader()
+                    csv_writer.writerow({
+                        k: "; ".join(str(x) for x in v) if isinstance(v, list) else v
+                        for k, v in transformed.items()
+                    })
+            
+            if json_file:
+                json_file.write("\n]}\n")
         
-        logger.info(f"Exported to {filename}")
+        if json_file:
+            logger.info(f"Exported {len(self.discovered_content)} items to {json_filename}")
+        if csv_file:
+            logger.info(f"Exported to {csv_filename}")
     
     def print_summary(self):
         """Print discovery summary."""
@@ -518,15 +766,15 @@ class DIKSHADiscoveryAgent:
         logger.info(f"Total Requests: {self.stats['total_requests']}")
         
         logger.info("\nBy Language:")
-        for lang, count in sorted(self.stats["by_language"].items(), key=lambda x: x[1], reverse=True)[:5]:
+        for lang, count in self.stats["by_language"].most_common(5):
             logger.info(f"   • {lang}: {count}")
         
         logger.info("\nBy Board:")
-        for board, count in sorted(self.stats["by_board"].items(), key=lambda x: x[1], reverse=True):
+        for board, count in self.stats["by_board"].most_common():
             logger.info(f"   • {board}: {count}")
         
         logger.info("\nBy Subject:")
-        for subj, count in sorted(self.stats["by_subject"].items(), key=lambda x: x[1], reverse=True)[:5]:
+        for subj, count in self.stats["by_subject"].most_common(5):
             logger.info(f"   • {subj}: {count}")
 
 
@@ -537,23 +785,21 @@ class DIKSHADiscoveryAgent:
 def main():
     """Main execution"""
     
-    agent = DIKSHADiscoveryAgent(project_id="bharat-connect-000")
-    
-    # Systematic discovery
-    report = agent.discover_systematic(
-        boards=["CBSE", "NCERT"],
-        grades=["Class 10", "Class 11", "Class 12"],
-        subjects=["Mathematics", "Science"],
-        mediums=["English", "Hindi"],
-        items_per_combination=100
-    )
-    
-    # Print summary
-    agent.print_summary()
-    
-    # Export
-    agent.export_to_json()
-    agent.export_to_csv()
+    with DIKSHADiscoveryAgent(project_id="bharat-connect-000") as agent:
+        # Systematic discovery
+        report = agent.discover_systematic(
+            boards=["CBSE", "NCERT"],
+            grades=["Class 10", "Class 11", "Class 12"],
+            subjects=["Mathematics", "Science"],
+            mediums=["English", "Hindi"],
+            items_per_combination=100
+        )
+        
+        # Print summary
+        agent.print_summary()
+        
+        # Export (JSON + CSV in one pass)
+        agent.export_all()
     
     logger.info("\nDiscovery complete!")
 
@@ -8,13 +8,28 @@ Stage 2: Deep AI-powered analysis for non-obvious feeds
 import vertexai
 from vertexai.generative_models import GenerativeModel, GenerationConfig
 import json
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import queue
+import sqlite3
+import threading
 import time
 import requests
 import re
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin, urlparse, urlencode
+from pathlib import Path
+from validation_store import normalize_url
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401 - only needed as the BeautifulSoup backend
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
 try:
     from selenium import webdriver
@@ -33,7 +48,102 @@ except ImportError:
     print("WARNING: Install: pip install selenium selenium-stealth webdriver-manager")
 
 
+# A feed-looking link anywhere in the raw HTML; pages without one that run
+# scripts may build their links client-side and need a real browser
+_FEED_HREF_RE = re.compile(r'href\s*=\s*["\'][^"\']*(?:rss|feed|atom|\.xml)', re.IGNORECASE)
+
+# Stage 1 link heuristics, compiled once. A .xml/.rss suffix is a high
+# confidence feed URL; any other feed marker in the URL is medium.
+_HIGH_CONF_HREF_RE = re.compile(r'\.(?:xml|rss)$', re.IGNORECASE)
+_MED_CONF_HREF_RE = re.compile(r'/feed/|/rss/|RelId=|rss|feed|atom|RssMain', re.IGNORECASE)
+# Keyword unions scanned once over lower-cased, NUL-joined link fields
+_TEXT_KEYWORD_RE = re.compile(r'rss|feed|atom|xml|subscribe')
+_ATTR_KEYWORD_RE = re.compile(r'rss|feed')
+
+# Stage 1 only looks at anchors, so skip building the rest of the tree
+_ANCHOR_STRAINER = SoupStrainer('a', href=True)
+
+# Stage 2 link index: quoted strings and data-* attributes that mention a
+# feed, plus <link rel> tags
+_QUOTED_FEED_RE = re.compile(r'["\']([^"\'\s<>]*(?:feed|rss|xml|atom)[^"\'\s<>]*)["\']', re.IGNORECASE)
+_DATA_FEED_RE = re.compile(r'\b(data-[\w-]*feed[\w-]*)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_LINK_TAG_STRAINER = SoupStrainer('link', rel=True)
+
+# In the browser, read just the anchors Stage 1 needs and the HTML sample
+# Stage 2 needs instead of serializing the whole DOM through page_source
+_ANCHORS_JS = (
+    "return Array.from(document.querySelectorAll('a[href]')).map("
+    "a => [a.getAttribute('href'), a.textContent, a.title, a.className, a.id]);"
+)
+_HTML_SAMPLE_JS = "return document.documentElement.outerHTML.slice(0, arguments[0]);"
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class FeedCache:
+    """SQLite-backed cache of the feeds found on each page, so re-running
+    discovery on the same site skips pages analyzed within the last `ttl`
+    seconds. Keyed by canonical page URL; expired rows are purged on open.
+    """
+    
+    def __init__(self, db_path: str = "./data/feed_cache.db", ttl: float = 24 * 3600):
+        self.ttl = ttl
+        self.db_file = Path(db_path)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), timeout=30, check_same_thread=False)
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL;")
+        except Exception:
+            pass
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_feeds ("
+                "url TEXT PRIMARY KEY, expires_at REAL NOT NULL, feeds TEXT NOT NULL)"
+            )
+            self.conn.execute("DELETE FROM page_feeds WHERE expires_at < ?", (time.time(),))
+            self.conn.commit()
+    
+    def get(self, page_url: str) -> Optional[List[Dict]]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT feeds FROM page_feeds WHERE url = ? AND expires_at >= ?",
+                (normalize_url(page_url), time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def set(self, page_url: str, feeds: List[Dict]):
+        data = json.dumps(feeds, ensure_ascii=False)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO page_feeds (url, expires_at, feeds) VALUES (?, ?, ?)",
+                (normalize_url(page_url), time.time() + self.ttl, data)
+            )
+            self.conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
 class UltimateAIScraper:
+    # Combos are tested in parallel. Most pages are plain HTTP fetches, so
+    # many workers can run at once; only COMBO_WORKERS of them may hold a
+    # headless Chrome at a time (Chrome memory is the limit there)
+    HTTP_WORKERS = 16
+    COMBO_WORKERS = 4
+    # Pages whose Stage 1 result is thin are queued and sent to Gemini
+    # this many at a time, one prompt per batch
+    STAGE2_BATCH_SIZE = 8
+    # Gemini sees a link index of each page, not its HTML; this caps one
+    # page's index, and how much HTML a browser page hands back to build it
+    STAGE2_SUMMARY_CHARS = 8000
+    STAGE2_SAMPLE_CHARS = 150000 // STAGE2_BATCH_SIZE
+    
     def __init__(self, project_id: str, location: str = "us-central1"):
         print("\n" + "="*80)
         print("TWO-STAGE INTELLIGENT RSS DISCOVERY")
@@ -50,12 +160,37 @@ class UltimateAIScraper:
         
         self.driver = None
         self.discovered_feeds: List[Dict] = []
-        self.visited_urls: Set[str] = set()
+        # Canonical URLs of discovered_feeds, for O(1) duplicate checks
+        self._discovered_urls: Set[str] = set()
+        self.visited_urls: Set[Tuple] = set()
+        # Canonical feed URLs (see normalize_url) already handed out
         self.seen_feed_urls: Set[str] = set()
+        self._seen_lock = threading.Lock()
+        
+        # Plain HTTP for combo pages with a known URL; Chrome is only used
+        # for pages whose links are rendered by JavaScript
+        self.http = requests.Session()
+        self.http.headers.update(HTTP_HEADERS)
+        adapter = HTTPAdapter(pool_connections=self.HTTP_WORKERS, pool_maxsize=self.HTTP_WORKERS,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        
+        # Idle worker browsers, created on first use (at most COMBO_WORKERS)
+        self._idle_drivers = queue.Queue()
+        self._worker_drivers = []
+        self._driver_slots = threading.BoundedSemaphore(self.COMBO_WORKERS)
         
-        # API rate limiting: prefer one call per minute to avoid quota
+        # API rate limiting: prefer one call per minute to avoid quota.
+        # Workers share the slot, one Gemini call at a time.
         self.api_delay = 60.0  # seconds
         self.last_api_call = 0.0
+        self._api_lock = threading.Lock()
+        self._stage2_queue: List[Tuple[str, str]] = []
+        
+        # Opened per discover() run; pages answered from it are not re-cached
+        self.feed_cache: Optional[FeedCache] = None
+        self._cached_pages: Set[str] = set()
         
         print("Gemini 2.0 Flash initialized\n")
 
@@ -82,17 +217,22 @@ class UltimateAIScraper:
             return
         
         print("Initializing Selenium...")
+        self.driver = self._new_driver()
+        print("Selenium ready\n")
+
+    def _new_driver(self):
+        """Headless, stealth-patched Chrome."""
         options = Options()
         options.add_argument('--headless=new')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         
-        self.driver = webdriver.Chrome(
+        driver = webdriver.Chrome(
             service=Service(ChromeDriverManager().install()),
             options=options
         )
         
-        stealth(self.driver, 
+        stealth(driver, 
                 languages=["en-US"], 
                 vendor="Google Inc.",
                 platform="Win32", 
@@ -100,7 +240,92 @@ class UltimateAIScraper:
                 renderer="Intel Iris OpenGL Engine", 
                 fix_hairline=True)
         
-        print("Selenium ready\n")
+        return driver
+
+    @contextmanager
+    def _worker_driver(self):
+        """Borrow a worker browser for one combo; a new one is started when
+        none is idle. Blocks while COMBO_WORKERS browsers are in use."""
+        with self._driver_slots:
+            try:
+                driver = self._idle_drivers.get_nowait()
+            except queue.Empty:
+                driver = self._new_driver()
+                self._worker_drivers.append(driver)
+            try:
+                yield driver
+            finally:
+                self._idle_drivers.put(driver)
+
+    def _quit_drivers(self):
+        """Close the main browser and every worker browser."""
+        for driver in [self.driver] + self._worker_drivers:
+            if driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+        self.driver = None
+        self._worker_drivers = []
+        self._idle_drivers = queue.Queue()
+
+    @staticmethod
+    def _dropdown_signature(driver, name: str) -> Tuple[str, ...]:
+        """Option texts of a dropdown, () if it is not on the page (yet)."""
+        try:
+            return tuple(o.text for o in Select(driver.find_element(By.NAME, name)).options)
+        except Exception:
+            return ()
+
+    def _wait_for_dropdown_refresh(self, name: str, old_signature: Tuple[str, ...],
+                                   driver=None, timeout: float = 5) -> bool:
+        """Wait until dropdown `name` shows options other than old_signature."""
+        driver = driver or self.driver
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: self._dropdown_signature(d, name) not in ((), old_signature)
+            )
+            return True
+        except Exception:
+            return False
+
+    def _wait_for_dropdowns(self, driver=None, timeout: float = 10) -> bool:
+        """Wait for a freshly loaded page to render its dropdowns."""
+        driver = driver or self.driver
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.TAG_NAME, 'select'))
+            )
+            return True
+        except Exception:
+            return False
+
+    def _select_combo(self, driver, combo: Dict) -> bool:
+        """Set each dropdown of a combo in order, waiting for the next one to
+        repopulate after every selection.
+
+        Returns:
+            False as soon as a dropdown cannot be set
+        """
+        names = list(combo)
+        for n, dropdown_name in enumerate(names):
+            next_name = names[n + 1] if n + 1 < len(names) else None
+            old_signature = self._dropdown_signature(driver, next_name) if next_name else ()
+            try:
+                Select(driver.find_element(By.NAME, dropdown_name)).select_by_value(combo[dropdown_name])
+            except Exception:
+                print(f"    Could not set {dropdown_name}={combo[dropdown_name]}")
+                return False
+            if next_name:
+                self._wait_for_dropdown_refresh(next_name, old_signature, driver)
+        return True
+
+    def _wait_for_url_change(self, driver, old_url: str, timeout: float = 3):
+        """Give a selection's navigation up to timeout seconds to land."""
+        try:
+            WebDriverWait(driver, timeout).until(lambda d: d.current_url != old_url)
+        except Exception:
+            pass
 
     def _extract_cascading_dropdowns_live(self, url: str) -> List[Dict]:
         """Extract ALL dropdown combinations by interacting with cascading dropdowns."""
@@ -110,7 +335,7 @@ class UltimateAIScraper:
         
         try:
             self.driver.get(url)
-            time.sleep(3)
+            self._wait_for_dropdowns()
             
             all_combos = []
             
@@ -124,6 +349,9 @@ class UltimateAIScraper:
             primary_name = primary_select.get_attribute('name')
             primary_obj = Select(primary_select)
             
+            # The dropdown that repopulates when a primary option is chosen
+            dependent_name = selects[1].get_attribute('name') if len(selects) > 1 else None
+            
             primary_options = []
             for opt in primary_obj.options:
                 value = opt.get_attribute('value')
@@ -137,13 +365,21 @@ class UltimateAIScraper:
                 print(f"  [{i}/{len(primary_options)}] Testing {primary_opt['text']}...")
                 
                 try:
-                    self.driver.get(url)
-                    time.sleep(2)
-                    
-                    primary_select = self.driver.find_element(By.NAME, primary_name)
-                    primary_obj = Select(primary_select)
-                    primary_obj.select_by_value(primary_opt['value'])
-                    time.sleep(2)
+                    # Re-select on the page that is already loaded; the page
+                    # is only reloaded when the dropdown can no longer be set
+                    # in place (e.g. a postback navigated somewhere else)
+                    old_signature = self._dropdown_signature(self.driver, dependent_name) if dependent_name else ()
+                    try:
+                        primary_select = self.driver.find_element(By.NAME, primary_name)
+                        Select(primary_select).select_by_value(primary_opt['value'])
+                    except Exception:
+                        self.driver.get(url)
+                        self._wait_for_dropdowns()
+                        old_signature = self._dropdown_signature(self.driver, dependent_name) if dependent_name else ()
+                        primary_select = self.driver.find_element(By.NAME, primary_name)
+                        Select(primary_select).select_by_value(primary_opt['value'])
+                    if dependent_name:
+                        self._wait_for_dropdown_refresh(dependent_name, old_signature)
                     
                     current_combo = {primary_name: primary_opt['value']}
                     current_selects = self.driver.find_elements(By.TAG_NAME, 'select')
@@ -173,23 +409,39 @@ class UltimateAIScraper:
             print(f"Error extracting cascading dropdowns: {e}\n")
             return []
 
-    def _stage1_fast_heuristic_extraction(self, page_html: str, base_url: str) -> List[Dict]:
-        """STAGE 1: Comprehensive heuristic-based extraction."""
+    @staticmethod
+    def _anchors_from_html(page_html: str) -> List[Tuple[str, str, str, str, str]]:
+        """(href, text, title, class, id) for every <a href> in the HTML."""
+        soup = BeautifulSoup(page_html, HTML_PARSER, parse_only=_ANCHOR_STRAINER)
+        return [
+            (link.get('href', ''), link.get_text(), link.get('title', ''),
+             ' '.join(link.get('class', [])), link.get('id', ''))
+            for link in soup.find_all('a')
+        ]
+
+    def _stage1_fast_heuristic_extraction(self, page_html: str, base_url: str,
+                                          anchors: Optional[List[Tuple]] = None) -> List[Dict]:
+        """STAGE 1: Comprehensive heuristic-based extraction.
+
+        Args:
+            anchors: (href, text, title, class, id) tuples already read from
+                the browser; parsed from page_html when not given
+        """
         print("Stage 1: Comprehensive heuristic extraction...")
         
         feeds = []
+        page_keys = set()
         
         try:
-            soup = BeautifulSoup(page_html, 'html.parser')
-            all_links = soup.find_all('a', href=True)
+            all_links = anchors if anchors is not None else self._anchors_from_html(page_html)
             
             print(f"    Analyzing {len(all_links)} links on page...")
             
-            for link in all_links:
+            for raw_href, raw_text, raw_title, raw_class, raw_id in all_links:
                 try:
-                    href = link.get('href', '').strip()
-                    text = link.get_text().strip()
-                    title_attr = link.get('title', '').strip()
+                    href = (raw_href or '').strip()
+                    text = (raw_text or '').strip()
+                    title_attr = (raw_title or '').strip()
                     
                     if not href:
                         continue
@@ -198,53 +450,27 @@ class UltimateAIScraper:
                     confidence = 'low'
                     
                     # Strategy 1: URL patterns
-                    url_patterns = [
-                        r'\.xml$',
-                        r'\.rss$',
-                        r'/feed/',
-                        r'/rss/',
-                        r'RelId=',
-                        r'rss',
-                        r'feed',
-                        r'atom',
-                        r'RssMain',
-                    ]
-                    
-                    for pattern in url_patterns:
-                        if re.search(pattern, href, re.IGNORECASE):
-                            is_feed = True
-                            if pattern in [r'\.xml$', r'\.rss$']:
-                                confidence = 'high'
-                            else:
-                                confidence = 'medium'
-                            break
-                    
-                    # Strategy 2: Link text contains RSS/Feed keywords
-                    text_keywords = ['rss', 'feed', 'atom', 'xml', 'subscribe']
-                    if text.lower() in text_keywords or any(keyword in text.lower() for keyword in text_keywords):
+                    if _HIGH_CONF_HREF_RE.search(href):
                         is_feed = True
-                        if confidence == 'low':
-                            confidence = 'medium'
-                    
-                    # Strategy 3: Title attribute
-                    if any(keyword in title_attr.lower() for keyword in text_keywords):
+                        confidence = 'high'
+                    elif _MED_CONF_HREF_RE.search(href):
                         is_feed = True
-                        if confidence == 'low':
-                            confidence = 'medium'
+                        confidence = 'medium'
                     
-                    # Strategy 4: Link class or id
-                    link_class = ' '.join(link.get('class', [])).lower()
-                    link_id = link.get('id', '').lower()
-                    if 'rss' in link_class or 'feed' in link_class or 'rss' in link_id or 'feed' in link_id:
+                    # Strategies 2-3: Link text or title attribute contains
+                    # RSS/Feed keywords; Strategy 4: link class or id does
+                    if (_TEXT_KEYWORD_RE.search(f"{text}\0{title_attr}".lower())
+                            or _ATTR_KEYWORD_RE.search(f"{raw_class or ''}\0{raw_id or ''}".lower())):
                         is_feed = True
                         if confidence == 'low':
                             confidence = 'medium'
                     
                     if is_feed:
                         full_url = urljoin(base_url, href)
-                        
-                        if full_url in self.seen_feed_urls:
+                        page_key = normalize_url(full_url)
+                        if page_key in page_keys:
                             continue
+                        page_keys.add(page_key)
                         
                         feed_title = text if text else (title_attr if title_attr else 'RSS Feed')
                         
@@ -253,7 +479,6 @@ class UltimateAIScraper:
                             'title': feed_title,
                             'confidence': confidence
                         })
-                        self.seen_feed_urls.add(full_url)
                         
                         print(f"    Found: {feed_title[:40]} [{confidence}]")
                         
@@ -267,21 +492,35 @@ class UltimateAIScraper:
             print(f"    Extraction error: {e}\n")
             return []
 
-    def _stage2_ai_deep_analysis(self, html: str, url: str) -> List[Dict]:
-        """STAGE 2: Deep AI-powered analysis for non-obvious feeds."""
-        print("Stage 2: AI deep analysis...")
+    def _stage2_ai_deep_analysis(self, pages: List[Tuple[str, str]]) -> Dict[str, List[Dict]]:
+        """STAGE 2: Deep AI-powered analysis for non-obvious feeds.
+
+        Args:
+            pages: (url, link_index) pairs analyzed together in one prompt,
+                see _extract_ai_candidates
+
+        Returns:
+            New feeds found, keyed by page URL
+        """
+        print(f"Stage 2: AI deep analysis of {len(pages)} pages...")
         
-        html_sample = html[:150000]
+        page_sections = "\n\n".join(
+            f"Page {n} URL: {url}\nLINK INDEX:\n{link_index}"
+            for n, (url, link_index) in enumerate(pages, 1)
+        )
         
-        prompt = f"""Analyze this page to find RSS/Atom feed URLs that might not be obvious.
+        prompt = f"""Analyze these pages to find RSS/Atom feed URLs that might not be obvious.
 
-URL: {url}
+Each page is given as a link index extracted from its HTML, one entry per line:
+  link rel=... type=... href=...   <link> tags
+  data-...=...                     data attributes mentioning feeds
+  string ...                       quoted strings in markup/scripts mentioning feed, rss, xml or atom
+  a <href> <text>                  anchors
 
-HTML:
-{html_sample}
+{page_sections}
 
 YOUR TASK:
-Find feed URLs that might be hidden or non-obvious:
+For each page, find feed URLs that might be hidden or non-obvious:
 1. JavaScript-generated URLs
 2. Data attributes (data-feed-url, etc.)
 3. Hidden links or buttons
@@ -291,13 +530,16 @@ Find feed URLs that might be hidden or non-obvious:
 
 Be creative - look beyond obvious <a> tags.
 
-RESPOND WITH JSON:
-[
-  {{"url": "https://actual-feed-url.xml", "title": "Feed Title", "confidence": "high"}},
-  {{"url": "https://api.site.com/feed/123", "title": "API Feed", "confidence": "medium"}}
-]
+RESPOND WITH A JSON OBJECT KEYED BY PAGE NUMBER ("Page 1" to "Page {len(pages)}"):
+{{
+  "Page 1": [
+    {{"url": "https://actual-feed-url.xml", "title": "Feed Title", "confidence": "high"}},
+    {{"url": "https://api.site.com/feed/123", "title": "API Feed", "confidence": "medium"}}
+  ],
+  "Page 2": []
+}}
 
-Return [] if none found.
+Use [] for pages where none are found.
 """
         
         # Use bounded retry/time budget and respect api slot (1/min). On
@@ -313,12 +555,12 @@ Return [] if none found.
             remaining_time = max_total_wait - elapsed_total
             if remaining_time <= 0:
                 print("    AI analysis retries/time budget exhausted; returning no feeds\n")
-                return []
+                return {}
 
             slot_ok = self._wait_for_api_slot(max_wait=remaining_time)
             if not slot_ok:
                 print("    Not enough time to wait for API slot; returning no feeds\n")
-                return []
+                return {}
 
             try:
                 response = self.model.generate_content(prompt, generation_config=self.config)
@@ -328,15 +570,29 @@ Return [] if none found.
 
                 cleaned = response.text
                 cleaned = re.sub(r'\s*```$', '', cleaned)
-                feeds = json.loads(cleaned.strip())
+                feeds_by_page = json.loads(cleaned.strip())
+                if not isinstance(feeds_by_page, dict):
+                    feeds_by_page = {}
 
-                new_feeds = [f for f in feeds if f.get('url') not in self.seen_feed_urls]
-
-                for feed in new_feeds:
-                    self.seen_feed_urls.add(feed.get('url', ''))
+                # Pages missing from the response get no entry, so callers
+                # can tell them apart from pages with no feeds
+                # Pages are keyed by number, not URL, so a URL the model
+                # re-escapes or normalizes can't lose a page's feeds
+                new_feeds = {}
+                for n, (url, _) in enumerate(pages, 1):
+                    page_feeds = feeds_by_page.get(f"Page {n}")
+                    if not isinstance(page_feeds, list):
+                        continue
+                    new_feeds[url] = []
+                    for feed in page_feeds:
+                        if not isinstance(feed, dict) or not feed.get('url'):
+                            continue
+                        # Suggestions may echo relative hrefs from the index
+                        feed['url'] = urljoin(url, feed['url'])
+                        new_feeds[url].append(feed)
 
-                print(f"    Found {len(new_feeds)} additional feed URLs\n")
-                return new_feeds if isinstance(new_feeds, list) else []
+                print(f"    Found {sum(len(f) for f in new_feeds.values())} additional feed URLs\n")
+                return new_feeds
 
             except Exception as e:
                 msg = str(e)
@@ -348,29 +604,86 @@ Return [] if none found.
                     remaining_time = max_total_wait - elapsed_total
                     if remaining_time <= 0:
                         print("    Gemini quota exceeded after retries; returning no feeds\n")
-                        return []
+                        return {}
                     sleep = min(backoff * (2 ** (attempt - 1)), max(1, remaining_time))
                     print(f"    Gemini quota/429 detected, backing off for {sleep}s and retrying...")
                     time.sleep(sleep)
                     continue
                 else:
-                    return []
+                    return {}
+
+    def _flush_stage2_batch(self, batch_size: int = None) -> Dict[str, List[Dict]]:
+        """Run Stage 2 on up to batch_size queued pages in a single Gemini call."""
+        batch_size = batch_size or self.STAGE2_BATCH_SIZE
+        with self._api_lock:
+            batch = self._stage2_queue[:batch_size]
+            del self._stage2_queue[:batch_size]
+            if not batch:
+                return {}
+            return self._stage2_ai_deep_analysis(batch)
 
-    def _intelligent_feed_discovery(self, page_html: str, page_url: str) -> List[Dict]:
-        """Two-stage intelligent feed discovery with fallback."""
-        stage1_feeds = self._stage1_fast_heuristic_extraction(page_html, page_url)
+    def _extract_ai_candidates(self, page_html: str, anchors: Optional[List[Tuple]] = None) -> str:
+        """Compact link index of a page for Stage 2, at most
+        STAGE2_SUMMARY_CHARS long (most specific entries first)."""
+        lines = []
+        try:
+            soup = BeautifulSoup(page_html, HTML_PARSER, parse_only=_LINK_TAG_STRAINER)
+            for link in soup.find_all('link'):
+                rel = ' '.join(link.get('rel', []))
+                lines.append(f"link rel={rel} type={link.get('type', '')} href={link.get('href', '')}")
+        except Exception:
+            pass
+        lines.extend(f"{name}={value}" for name, value in _DATA_FEED_RE.findall(page_html))
+        lines.extend(f"string {value}" for value in _QUOTED_FEED_RE.findall(page_html))
+        try:
+            if anchors is None:
+                anchors = self._anchors_from_html(page_html)
+            for href, text, *_ in anchors:
+                lines.append(f"a {href} {' '.join((text or '').split())[:60]}")
+        except Exception:
+            pass
         
-        if len(stage1_feeds) >= 2:
-            print(f"    Stage 1 sufficient ({len(stage1_feeds)} feeds)\n")
-            return stage1_feeds
+        summary = []
+        size = 0
+        for line in dict.fromkeys(lines):
+            size += len(line) + 1
+            if size > self.STAGE2_SUMMARY_CHARS:
+                break
+            summary.append(line)
+        return "\n".join(summary)
+
+    def _claim_feeds(self, feeds: List[Dict]) -> int:
+        """Mark feeds as seen; returns how many had not been seen before."""
+        with self._seen_lock:
+            before = len(self.seen_feed_urls)
+            self.seen_feed_urls.update(normalize_url(f.get('url') or '') for f in feeds)
+            return len(self.seen_feed_urls) - before
+
+    def _intelligent_feed_discovery(self, page_html: str, page_url: str,
+                                    anchors: Optional[List[Tuple]] = None) -> List[Dict]:
+        """Two-stage intelligent feed discovery with fallback.
+
+        Stage 1 runs immediately; pages where it finds fewer than two feeds
+        not already seen on other pages are queued for a batched Gemini call
+        (see _flush_stage2_batch).
+
+        Returns:
+            Every feed Stage 1 found on the page, including ones other pages
+            also list
+        """
+        stage1_feeds = self._stage1_fast_heuristic_extraction(page_html, page_url, anchors)
+        new_count = self._claim_feeds(stage1_feeds)
         
-        print(f"    Stage 1 found only {len(stage1_feeds)} feeds - triggering Stage 2")
-        stage2_feeds = self._stage2_ai_deep_analysis(page_html, page_url)
+        if new_count >= 2:
+            print(f"    Stage 1 sufficient ({new_count} new feeds)\n")
+            return stage1_feeds
         
-        all_feeds = stage1_feeds + stage2_feeds
-        print(f"    Total: {len(all_feeds)} feeds\n")
+        print(f"    Stage 1 found only {new_count} new feeds - queued for Stage 2\n")
+        link_index = self._extract_ai_candidates(page_html, anchors)
+        with self._api_lock:
+            self._stage2_queue.append((page_url, link_index))
         
-        return all_feeds
+        return stage1_feeds
 
     def _learn_url_pattern_robust(self, base_url: str, test_combos: List[Dict], num_tests: int = 5) -> Dict:
         """Learn URL parameter pattern by testing multiple combinations."""
@@ -385,29 +698,18 @@ Return [] if none found.
                 print(f"    Combo: {combo}")
                 
                 self.driver.get(base_url)
-                time.sleep(2)
+                self._wait_for_dropdowns()
+                loaded_url = self.driver.current_url
                 
-                all_set = True
-                for dropdown_name, value in combo.items():
-                    try:
-                        select_elem = self.driver.find_element(By.NAME, dropdown_name)
-                        select_obj = Select(select_elem)
-                        select_obj.select_by_value(value)
-                        time.sleep(0.8)
-                    except Exception as e:
-                        print(f"    Could not set {dropdown_name}={value}")
-                        all_set = False
-                        break
-                
-                if not all_set:
+                if not self._select_combo(self.driver, combo):
                     continue
                 
-                time.sleep(3)
+                self._wait_for_url_change(self.driver, loaded_url)
                 
                 current_url = self.driver.current_url
                 print(f"    Result: {current_url}")
                 
-                from urllib.parse import urlparse, parse_qs
+                from urllib.parse import parse_qs
                 parsed = urlparse(current_url)
                 params = parse_qs(parsed.query)
                 
@@ -449,8 +751,6 @@ Return [] if none found.
 
     def _construct_url_from_combo(self, base_url: str, combo: Dict, param_mapping: Dict) -> str:
         """Construct URL using learned parameter mapping."""
-        from urllib.parse import urlencode
-        
         mapped_params = {}
         for full_name, value in combo.items():
             short_name = param_mapping.get(full_name, full_name)
@@ -463,143 +763,231 @@ Return [] if none found.
         else:
             return f"{base_url}?{param_string}"
 
-    def _safe_get(self, url: str) -> Tuple[bool, str]:
-        """Safely navigate to URL and wait for JavaScript content."""
+    def _read_page(self, driver) -> Tuple[str, Optional[List[Tuple]]]:
+        """Read the rendered page as (html_sample, anchors).
+
+        Falls back to (page_source, None) if the scripts cannot run.
+        """
         try:
-            self.driver.get(url)
+            anchors = [tuple(a) for a in driver.execute_script(_ANCHORS_JS)]
+            html = driver.execute_script(_HTML_SAMPLE_JS, self.STAGE2_SAMPLE_CHARS)
+            return html, anchors
+        except Exception:
+            return driver.page_source, None
+
+    def _safe_get(self, url: str, driver=None) -> Tuple[bool, str, Optional[List[Tuple]]]:
+        """Safely navigate to URL and wait for JavaScript content.
+
+        Returns:
+            (success, html, anchors) - see _read_page
+        """
+        driver = driver or self.driver
+        try:
+            driver.get(url)
             
             # Check for alert first
             try:
-                alert = self.driver.switch_to.alert
+                alert = driver.switch_to.alert
                 alert.accept()
-                return False, ""
+                return False, "", None
             except NoAlertPresentException:
                 pass
             
             # Wait for RSS links to appear
             try:
                 print(f"    Waiting for RSS links...")
-                WebDriverWait(self.driver, 10).until(
+                WebDriverWait(driver, 10).until(
                     lambda d: len(d.find_elements(By.XPATH, "//a[contains(@href, 'RssMain') or contains(@href, 'rss') or contains(@href, 'feed')]")) > 0
                 )
                 print(f"    Links loaded")
             except:
-                print(f"    Fallback wait (5s)...")
-                time.sleep(5)
+                print(f"    No feed links rendered")
             
-            html = self.driver.page_source
-            return True, html
+            html, anchors = self._read_page(driver)
+            return True, html, anchors
                 
         except Exception as e:
-            return False, ""
+            return False, "", None
 
-    def discover(self, start_url: str, max_pages: int = 500) -> List[Dict]:
-        """Main discovery method with robust URL pattern learning."""
-        print(f"Target: {start_url}\n")
+    def _http_get(self, url: str) -> Optional[str]:
+        """Fetch a page without a browser; None if the request fails."""
+        try:
+            response = self.http.get(url, timeout=10)
+            if response.status_code >= 400:
+                return None
+            return response.text
+        except Exception:
+            return None
+
+    @staticmethod
+    def _needs_browser(html: str) -> bool:
+        """No feed-like links in the static HTML, but scripts that could add them."""
+        return not _FEED_HREF_RE.search(html) and '<script' in html.lower()
+
+    def _process_combo(self, i: int, combo: Dict, total: int,
+                       start_url: str, param_mapping: Dict) -> Optional[Tuple[str, List[Dict]]]:
+        """Load one combo's page on a worker browser and run two-stage discovery.
+
+        Returns:
+            (page_url, feeds), or None if the page could not be loaded
+        """
+        combo_display = ', '.join([f"{k.split('$')[-1]}={v}" for k, v in combo.items()]) if combo else "base page"
+        print(f"[{i}/{total}] {combo_display[:70]}...")
         
-        start_time = datetime.now()
+        try:
+            if combo and param_mapping:
+                test_url = self._construct_url_from_combo(start_url, combo, param_mapping)
+                print(f"  🔗 {test_url}")
+            elif combo:
+                print(f"  No URL pattern - attempting form submission...")
+                with self._worker_driver() as driver:
+                    driver.get(start_url)
+                    self._wait_for_dropdowns(driver)
+                    loaded_url = driver.current_url
+                    
+                    self._select_combo(driver, combo)
+                    self._wait_for_url_change(driver, loaded_url)
+                    test_url = driver.current_url
+                    page_html, anchors = self._read_page(driver)
+                success = True
+            else:
+                test_url = start_url
+            
+            if not combo or param_mapping:
+                cached = self.feed_cache.get(test_url) if self.feed_cache else None
+                if cached is not None:
+                    print(f"  Cached ({len(cached)} feeds)\n")
+                    with self._seen_lock:
+                        self._cached_pages.add(test_url)
+                    self._claim_feeds(cached)
+                    return test_url, cached
+                
+                page_html = self._http_get(test_url)
+                anchors = None
+                success = page_html is not None
+                if not success or self._needs_browser(page_html):
+                    with self._worker_driver() as driver:
+                        success, page_html, anchors = self._safe_get(test_url, driver)
+            
+            if not success:
+                print(f"  Could not load\n")
+                return None
+            
+            return test_url, self._intelligent_feed_discovery(page_html, test_url, anchors)
         
-        combos = self._extract_cascading_dropdowns_live(start_url)
-        
-        if not combos:
-            print("No dropdown combinations found - testing base URL\n")
-            combos = [{}]
-        
-        if len(combos) > 5:
-            test_indices = [
-                0,
-                len(combos) // 4,
-                len(combos) // 2,
-                3 * len(combos) // 4,
-                len(combos) - 1
-            ]
-            test_combos = [combos[i] for i in test_indices]
+        except Exception as e:
+            print(f"  Error: {str(e)[:80]}")
+            return None
+
+    def _record_feeds(self, feeds: List[Dict], test_url: str, combo: Dict):
+        """Add a page's feeds to discovered_feeds, skipping known URLs."""
+        if feeds:
+            print(f"  Page lists {len(feeds)} feeds")
+            
+            for feed_info in feeds:
+                url = feed_info.get('url', '')
+                title = feed_info.get('title', 'Untitled')
+                confidence = feed_info.get('confidence', 'unknown')
+                
+                discovered_key = normalize_url(url)
+                if url and discovered_key not in self._discovered_urls:
+                    self._discovered_urls.add(discovered_key)
+                    self.discovered_feeds.append({
+                        'url': url,
+                        'title': title,
+                        'confidence': confidence,
+                        'source_page': test_url,
+                        'combo': combo,
+                        'discovered_at': datetime.now().isoformat()
+                    })
+                    print(f"     {title[:50]} ({confidence})")
         else:
-            test_combos = combos
+            print(f"  No feeds found")
         
-        print(f"Will test {len(test_combos)} combos for URL pattern learning\n")
-        
-        param_mapping = self._learn_url_pattern_robust(start_url, test_combos, num_tests=5)
-        
-        if len(combos) > max_pages:
-            print(f"Limiting from {len(combos)} to {max_pages} combinations\n")
-            combos = combos[:max_pages]
-        
-        print(f"Testing {len(combos)} combinations with two-stage extraction...\n")
-        print("="*80 + "\n")
+        print()
+
+    def discover(self, start_url: str, max_pages: int = 500) -> List[Dict]:
+        """Main discovery method with robust URL pattern learning."""
+        print(f"Target: {start_url}\n")
         
-        for i, combo in enumerate(combos, 1):
-            combo_key = str(sorted(combo.items()))
-            if combo_key in self.visited_urls:
-                continue
+        start_time = datetime.now()
+        self.feed_cache = FeedCache()
+        try:
+            combos = self._extract_cascading_dropdowns_live(start_url)
             
-            self.visited_urls.add(combo_key)
+            if not combos:
+                print("No dropdown combinations found - testing base URL\n")
+                combos = [{}]
             
-            combo_display = ', '.join([f"{k.split('$')[-1]}={v}" for k, v in combo.items()]) if combo else "base page"
-            print(f"[{i}/{len(combos)}] {combo_display[:70]}...")
+            if len(combos) > 5:
+                test_indices = [
+                    0,
+                    len(combos) // 4,
+                    len(combos) // 2,
+                    3 * len(combos) // 4,
+                    len(combos) - 1
+                ]
+                test_combos = [combos[i] for i in test_indices]
+            else:
+                test_combos = combos
             
-            try:
-                if combo and param_mapping:
-                    test_url = self._construct_url_from_combo(start_url, combo, param_mapping)
-                    print(f"  🔗 {test_url}")
-                elif combo:
-                    print(f"  No URL pattern - attempting form submission...")
-                    self.driver.get(start_url)
-                    time.sleep(2)
-                    
-                    for dropdown_name, value in combo.items():
-                        try:
-                            select_elem = self.driver.find_element(By.NAME, dropdown_name)
-                            select_obj = Select(select_elem)
-                            select_obj.select_by_value(value)
-                            time.sleep(0.5)
-                        except:
-                            pass
-                    
-                    time.sleep(3)
-                    test_url = self.driver.current_url
-                    page_html = self.driver.page_source
-                    success = True
-                else:
-                    test_url = start_url
-                
-                if not combo or param_mapping:
-                    success, page_html = self._safe_get(test_url)
-                
-                if not success:
-                    print(f"  Could not load\n")
+            print(f"Will test {len(test_combos)} combos for URL pattern learning\n")
+            
+            param_mapping = self._learn_url_pattern_robust(start_url, test_combos, num_tests=5)
+            
+            if len(combos) > max_pages:
+                print(f"Limiting from {len(combos)} to {max_pages} combinations\n")
+                combos = combos[:max_pages]
+            
+            print(f"Testing {len(combos)} combinations with two-stage extraction...\n")
+            print("="*80 + "\n")
+            
+            pending = []
+            for combo in combos:
+                combo_key = tuple(sorted(combo.items()))
+                if combo_key in self.visited_urls:
                     continue
-                
-                feeds = self._intelligent_feed_discovery(page_html, test_url)
-                
-                if feeds:
-                    print(f"  Discovered {len(feeds)} unique feeds")
-                    
-                    for feed_info in feeds:
-                        url = feed_info.get('url', '')
-                        title = feed_info.get('title', 'Untitled')
-                        confidence = feed_info.get('confidence', 'unknown')
-                        
-                        if url and url not in [f['url'] for f in self.discovered_feeds]:
-                            self.discovered_feeds.append({
-                                'url': url,
-                                'title': title,
-                                'confidence': confidence,
-                                'source_page': test_url,
-                                'combo': combo,
-                                'discovered_at': datetime.now().isoformat()
-                            })
-                            print(f"     {title[:50]} ({confidence})")
-                else:
-                    print(f"  No feeds found")
-                    
-            except Exception as e:
-                print(f"  Error: {str(e)[:80]}")
+                self.visited_urls.add(combo_key)
+                pending.append(combo)
             
-            print()
-        
-        if self.driver:
-            self.driver.quit()
+            # Combos are independent: workers load and analyze pages in parallel,
+            # results are merged here in combo order
+            with ThreadPoolExecutor(max_workers=self.HTTP_WORKERS) as pool:
+                results = pool.map(
+                    lambda args: self._process_combo(*args, len(pending), start_url, param_mapping),
+                    enumerate(pending, 1)
+                )
+                page_combos = {}
+                page_feeds = {}
+                for combo, result in zip(pending, results):
+                    if result is None:
+                        continue
+                    test_url, feeds = result
+                    page_combos[test_url] = combo
+                    page_feeds[test_url] = list(feeds)
+                    self._record_feeds(feeds, test_url, combo)
+            
+            # Stage 2 for the pages Stage 1 could not cover, a batch per call.
+            # A page is only complete once Gemini has answered for it.
+            incomplete = {url for url, _ in self._stage2_queue}
+            while self._stage2_queue:
+                for test_url, feeds in self._flush_stage2_batch().items():
+                    page_feeds.setdefault(test_url, []).extend(feeds)
+                    incomplete.discard(test_url)
+                    self._record_feeds(feeds, test_url, page_combos.get(test_url, {}))
+            
+            # Cache each completed page's full feed list, so a later run that
+            # only hits some pages still gets everything those pages list
+            for test_url, feeds in page_feeds.items():
+                if test_url not in self._cached_pages and test_url not in incomplete:
+                    self.feed_cache.set(test_url, feeds)
+        finally:
+            # Close the cache and browsers even if a stage fails, so no
+            # headless Chrome or SQLite handle outlives the run
+            self.feed_cache.close()
+            self.feed_cache = None
+            self._quit_drivers()
+            self.http.close()
         
         duration = (datetime.now() - start_time).total_seconds()
         
@@ -19,6 +19,8 @@ from collections import defaultdict
 import logging
 import json
 
+import numpy as np
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -73,7 +75,7 @@ class LearningAgent:
             Analysis report
         """
         
-        logger.info(f"Analyzing Iteration {iteration_num}...")
+        logger.info("Analyzing Iteration %s...", iteration_num)
         
         # If the caller provided rich validated report lists, use them to update counts
         if validated_reports is not None:
@@ -96,7 +98,8 @@ class LearningAgent:
             "strategy": strategy,
             "patterns": patterns,
             "validated_reports": validated_reports or [],
-            "rejected_reports": rejected_reports or []
+            "rejected_reports": rejected_reports or [],
+            "quality_stats": self._score_stats(validated_reports or [])
         }
         
         self.iteration_history.append(iteration_record)
@@ -115,9 +118,9 @@ class LearningAgent:
         insights = self._generate_insights(iteration_num, iteration_record, analysis)
         self.insights.extend(insights)
         
-        logger.info(f"   Iteration {iteration_num} analyzed")
-        logger.info(f"      Success rate: {success_rate:.1%}")
-        logger.info(f"      Efficiency: {generation_efficiency:.1%}")
+        logger.info("   Iteration %s analyzed", iteration_num)
+        logger.info("      Success rate: %.1f%%", success_rate * 100)
+        logger.info("      Efficiency: %.1f%%", generation_efficiency * 100)
         
         return {
             "iteration": iteration_num,
@@ -126,6 +129,31 @@ class LearningAgent:
             "insights": insights
         }
     
+    @staticmethod
+    def _score_stats(reports: List[Dict], top_k: int = 5) -> Dict:
+        """Summarize validator scores for an iteration in one vectorized pass."""
+        
+        if not reports:
+            return {"count": 0, "mean": 0.0, "std": 0.0, "p50": 0.0, "p90": 0.0, "top_urls": []}
+        
+        scores = np.fromiter((r.get("score", 0) or 0 for r in reports),
+                             dtype=np.float32, count=len(reports))
+        p50, p90 = np.percentile(scores, (50, 90))
+        
+        # O(N) top-k selection, then order just those k by score
+        k = min(top_k, len(scores))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        
+        return {
+            "count": len(reports),
+            "mean": float(scores.mean()),
+            "std": float(scores.std()),
+            "p50": float(p50),
+            "p90": float(p90),
+            "top_urls": [reports[i].get("url") for i in top]
+        }
+    
     def _analyze_patterns(self, patterns: Dict) -> Dict:
         """Analyze discovered patterns."""
         
@@ -188,6 +216,16 @@ class LearningAgent:
         else:
             insights.append(f"Iteration {iteration_num}: Low success rate ({success_rate:.1%})")
         
+        # Quality of the feeds validated this iteration
+        quality = iteration_record.get("quality_stats", {})
+        if quality.get("count"):
+            insights.append(
+                f"Validated feed quality: mean {quality['mean']:.0f}, median {quality['p50']:.0f}, "
+                f"p90 {quality['p90']:.0f} (std {quality['std']:.0f}, {quality['count']} feeds)"
+            )
+            if quality["top_urls"]:
+                insights.append(f"Highest-scoring feed: {quality['top_urls'][0]}")
+        
         # Strategy performance
         if strategy == "hybrid":
             insights.append(f"Strategy '{strategy}' provides balanced exploration")
@@ -440,22 +478,22 @@ class LearningAgent:
         logger.info("="*80)
 
         for insight in self.insights:
-            logger.info(f"  - {insight}")
+            logger.info("  - %s", insight)
 
         # Convergence assessment
         convergence = self.get_convergence_assessment()
         logger.info("\nConvergence Assessment:")
-        logger.info(f"   Status: {'Converging' if convergence['converging'] else 'Not converged'}")
-        logger.info(f"   Reason: {convergence['reason']}")
-        logger.info(f"   Confidence: {convergence['confidence']:.0%}")
-        logger.info(f"   Recommendation: {convergence['recommendation']}")
+        logger.info("   Status: %s", 'Converging' if convergence['converging'] else 'Not converged')
+        logger.info("   Reason: %s", convergence['reason'])
+        logger.info("   Confidence: %.0f%%", convergence['confidence'] * 100)
+        logger.info("   Recommendation: %s", convergence['recommendation'])
 
         # Strategy recommendation
         strategy = self.get_strategy_recommendation()
         logger.info("\nStrategy Recommendation:")
-        logger.info(f"   Recommended: {strategy['recommended']}")
-        logger.info(f"   Success Rate: {strategy.get('avg_success_rate', 0):.1%}")
-        logger.info(f"   Confidence: {strategy['confidence']:.0%}")
+        logger.info("   Recommended: %s", strategy['recommended'])
+        logger.info("   Success Rate: %.1f%%", strategy.get('avg_success_rate', 0) * 100)
+        logger.info("   Confidence: %.0f%%", strategy['confidence'] * 100)
 
 
 # Example usage
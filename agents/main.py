@@ -341,6 +341,9 @@ def main(force_phase1: bool = False):
                 print(f"   - {os.path.basename(checkpoint)}")
         
         raise
+    
+    finally:
+        coordinator.close()
 
 
 def show_available_checkpoints():
@@ -25,7 +25,7 @@ import json
 import time
 import requests
 import feedparser
-from validator_agent import AIValidatorAgent
+from validator_agent import AIValidatorAgent, pooled_session
 from typing import List, Dict, Set, Tuple, Optional
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
@@ -73,7 +73,7 @@ class URLStructureAnalyzer:
         self.path = None
         self.path_patterns = []
         
-        logger.info(f"URLStructureAnalyzer initialized with {len(feeds)} feeds")
+        logger.info("URLStructureAnalyzer initialized with %s feeds", len(feeds))
     
     def analyze(self) -> Dict:
         """
@@ -97,7 +97,7 @@ class URLStructureAnalyzer:
         # Summarize patterns
         summary = self._summarize_patterns()
         
-        logger.info(f"Extracted {len(self.parameters)} unique parameters")
+        logger.info("Extracted %s unique parameters", len(self.parameters))
         
         return summary
     
@@ -132,7 +132,7 @@ class URLStructureAnalyzer:
                 self.path_patterns.append(parsed.path)
         
         except Exception as e:
-            logger.error(f"Error parsing URL {url}: {e}")
+            logger.error("Error parsing URL %s: %s", url, e)
     
     def _summarize_patterns(self) -> Dict:
         """Summarize extracted patterns."""
@@ -236,7 +236,7 @@ class GeminiPatternLearner:
         self.api_delay = 60.0
         self.last_api_call = 0.0
         
-        logger.info(f"Gemini Pattern Learner initialized (project: {project_id})")
+        logger.info("Gemini Pattern Learner initialized (project: %s)", project_id)
     
     def _wait_for_api_slot(self, max_wait: Optional[float] = None) -> bool:
         """Wait until api_delay seconds have passed since last response.
@@ -397,7 +397,7 @@ Respond with JSON in this exact format:
 
             except Exception as e:
                 msg = str(e)
-                logger.error(f"Gemini pattern learning error (attempt {attempt}): {msg}")
+                logger.error("Gemini pattern learning error (attempt %s): %s", attempt, msg)
                 if ("429" in msg) or ("Resource exhausted" in msg) or ("quota" in msg.lower()):
                     # treat as a response (we got a quota) and back off
                     self.last_api_call = time.time()
@@ -407,7 +407,7 @@ Respond with JSON in this exact format:
                         logger.error("Gemini quota exceeded after retries; returning empty patterns")
                         return {}
                     sleep = min(backoff * (2 ** (attempt - 1)), max(1, remaining_time))
-                    logger.warning(f"Gemini quota/429 detected, backing off for {sleep}s and retrying...")
+                    logger.warning("Gemini quota/429 detected, backing off for %ss and retrying...", sleep)
                     time.sleep(sleep)
                     continue
                 else:
@@ -469,7 +469,7 @@ class IntelligentURLGenerator:
             return clean_url
         
         except Exception as e:
-            logger.error(f"Error stripping params from {url}: {e}")
+            logger.error("Error stripping params from %s: %s", url, e)
             return url
     
     def generate_candidates(self, strategy: str = "hybrid", max_candidates: int = 50) -> List[str]:
@@ -512,7 +512,7 @@ class IntelligentURLGenerator:
         # Limit to max_candidates
         final_candidates = unique_candidates[:max_candidates]
         
-        logger.info(f"Generated {len(final_candidates)} candidate URLs using {strategy}")
+        logger.info("Generated %s candidate URLs using %s", len(final_candidates), strategy)
         
         return final_candidates
     
@@ -598,14 +598,16 @@ class FeedValidator:
     with Gemini-powered validation for better accuracy.
     """
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, session: Optional[requests.Session] = None):
         """
         Initialize validator.
         
         Args:
             timeout: HTTP request timeout
+            session: Shared HTTP session (a private pooled one is created if omitted)
         """
         self.timeout = timeout
+        self.session = session or pooled_session()
         self.cache = {}
         
         logger.info("Feed Validator initialized")
@@ -630,11 +632,11 @@ class FeedValidator:
             headers = {
                 "User-Agent": "Mozilla/5.0 (compatible; BharatConnect/2.0; +https://example.com)"
             }
-            response = requests.get(url, timeout=self.timeout, allow_redirects=True, headers=headers)
+            response = self.session.get(url, timeout=self.timeout, allow_redirects=True, headers=headers)
 
             if response.status_code >= 400:
                 self.cache[url] = (False, {"error": f"HTTP {response.status_code}", "http_status": response.status_code})
-                logger.info(f"   HEAD/GET failed for {url} -> HTTP {response.status_code}")
+                logger.info("   HEAD/GET failed for %s -> HTTP %s", url, response.status_code)
                 return False, {"error": f"HTTP {response.status_code}", "http_status": response.status_code}
 
             content = response.text
@@ -655,7 +657,7 @@ class FeedValidator:
                 "sample": content[:500]
             }
 
-            logger.info(f"   Feed fetched {url} -> HTTP {response.status_code}, items={item_count}")
+            logger.info("   Feed fetched %s -> HTTP %s, items=%s", url, response.status_code, item_count)
 
             self.cache[url] = (is_valid, metadata)
 
@@ -703,7 +705,8 @@ class RAGAgent:
     def __init__(self,
                  project_id: str,
                  base_url: str,
-                 location: str = "us-central1"):
+                 location: str = "us-central1",
+                 session: Optional[requests.Session] = None):
         """
         Initialize RAG Agent.
         
@@ -711,6 +714,7 @@ class RAGAgent:
             project_id: Google Cloud project ID
             base_url: Base feed URL
             location: Vertex AI location
+            session: HTTP session shared by both candidate validators
         """
         self.project_id = project_id
         self.base_url = base_url
@@ -719,10 +723,11 @@ class RAGAgent:
     # Initialize components
         self.pattern_learner = GeminiPatternLearner(project_id, location)
         self.url_generator = IntelligentURLGenerator(base_url)
-        self.feed_validator = FeedValidator()
+        session = session or pooled_session()
+        self.feed_validator = FeedValidator(session=session)
         # Use AI validator for RAG candidate validation to match legit URL flow
         try:
-            self.ai_validator = AIValidatorAgent(project_id=project_id)
+            self.ai_validator = AIValidatorAgent(project_id=project_id, session=session)
         except Exception:
             # If AI validator cannot be initialized (no credentials / env),
             # fall back to lightweight validator to keep process working.
@@ -731,6 +736,8 @@ class RAGAgent:
         # State
         self.learned_patterns = {}
         self.discovered_feeds = []
+        # Every candidate URL sent for validation, valid or not
+        self.tested_urls = set()
         self.iteration_count = 0
         # Optional run id (set by Coordinator when running under an experiment)
         self.run_id = None
@@ -743,7 +750,7 @@ class RAGAgent:
             "iterations": []
         }
         
-        logger.info(f"RAG Agent initialized for {base_url}")
+        logger.info("RAG Agent initialized for %s", base_url)
     
     def learn_patterns(self, feeds: List[Dict]) -> Dict:
         """
@@ -755,13 +762,13 @@ class RAGAgent:
         Returns:
             Learned patterns
         """
-        logger.info(f"Learning patterns from {len(feeds)} feeds...")
+        logger.info("Learning patterns from %s feeds...", len(feeds))
         
         # Analyze URL structure
         analyzer = URLStructureAnalyzer(feeds)
         structure = analyzer.analyze()
         
-        logger.info(f"   Parameters found: {list(structure.get('parameters', {}).keys())}")
+        logger.info("   Parameters found: %s", list(structure.get('parameters', {}).keys()))
         
         # Learn with Gemini
         domain = urlparse(self.base_url).netloc
@@ -797,7 +804,7 @@ class RAGAgent:
         # Log top candidates
         logger.info("Top candidates:")
         for i, url in enumerate(candidates[:5], 1):
-            logger.info(f"   {i}. {url}")
+            logger.info("   %s. %s", i, url)
         
         return candidates
     
@@ -811,7 +818,8 @@ class RAGAgent:
         Returns:
             List of valid feeds
         """
-        logger.info(f"Validating {len(candidates)} candidates using AI validator...")
+        logger.info("Validating %s candidates using AI validator...", len(candidates))
+        self.tested_urls.update(candidates)
 
         # Prefer AI validator to perform the same validation as legit URLs.
         if self.ai_validator:
@@ -827,7 +835,7 @@ class RAGAgent:
                 if isinstance(rep, dict) and rep.get("url"):
                     self.discovered_feeds.append(rep)
 
-            logger.info(f"Validation complete: {len(validated)} new feeds found (AI)")
+            logger.info("Validation complete: %s new feeds found (AI)", len(validated))
             return {
                 "validated": validated,
                 "rejected": rejected,
@@ -846,7 +854,7 @@ class RAGAgent:
             for meta in valid_feeds:
                 self.discovered_feeds.append(meta)
 
-            logger.info(f"Validation complete: {len(valid_feeds)} new feeds found (lightweight)")
+            logger.info("Validation complete: %s new feeds found (lightweight)", len(valid_feeds))
             return {
                 "validated": valid_feeds,
                 "rejected": [],
@@ -854,10 +862,40 @@ class RAGAgent:
                 "rejected_reports": []
             }
     
+    def prepare_iteration(self,
+                          current_feeds: List[Dict],
+                          strategy: str = "hybrid",
+                          num_candidates: int = 50) -> Tuple[Dict, List[str]]:
+        """
+        Learn patterns and generate candidates for an iteration, without
+        validating them. Safe to run in the background while the previous
+        iteration's candidates are validated.
+        
+        Returns:
+            Tuple of (learned_patterns, candidate_urls)
+        """
+        patterns = self.learn_patterns(current_feeds)
+        candidates = self.generate_candidates(strategy, num_candidates)
+        return patterns, candidates
+    
+    def discard_prepared(self,
+                         prepared: Optional[Tuple[Dict, List[str]]],
+                         patterns: Dict):
+        """
+        Undo the side effects of a prepare_iteration() whose result will not
+        be run: its candidates leave the generated count and the learned
+        patterns go back to `patterns` (those of the last iteration run).
+        """
+        if prepared is not None:
+            self.stats["total_urls_generated"] -= len(prepared[1])
+        self.learned_patterns = patterns
+        self.url_generator.patterns = patterns
+    
     def run_iteration(self,
                      current_feeds: List[Dict],
                      strategy: str = "hybrid",
-                     num_candidates: int = 50) -> Dict:
+                     num_candidates: int = 50,
+                     prepared: Optional[Tuple[Dict, List[str]]] = None) -> Dict:
         """
         Run single RAG iteration.
         
@@ -865,6 +903,7 @@ class RAGAgent:
             current_feeds: Currently discovered feeds
             strategy: Generation strategy
             num_candidates: Number of candidates to generate
+            prepared: Result of prepare_iteration() if it already ran
             
         Returns:
             Iteration results
@@ -872,14 +911,13 @@ class RAGAgent:
         
         self.iteration_count += 1
         
-        logger.info(f"\nRAG Iteration {self.iteration_count}")
+        logger.info("\nRAG Iteration %s", self.iteration_count)
         logger.info("=" * 80)
         
-        # Learn patterns
-        self.learn_patterns(current_feeds)
-
-        # Generate candidates
-        candidates = self.generate_candidates(strategy, num_candidates)
+        # Learn patterns and generate candidates (unless done ahead of time)
+        if prepared is None:
+            prepared = self.prepare_iteration(current_feeds, strategy, num_candidates)
+        patterns, candidates = prepared
 
         # Validate
         validation_outcome = self.validate_candidates(candidates)
@@ -896,16 +934,17 @@ class RAGAgent:
             "new_feeds_found": len(validated),
             "total_feeds": len(self.discovered_feeds),
             "strategy": strategy,
+            "patterns": patterns,
             "validated_reports": validation_outcome.get("validated_reports", []),
             "rejected_reports": validation_outcome.get("rejected_reports", [])
         }
         
         self.stats["iterations"].append(iteration_result)
         
-        logger.info(f"Iteration {self.iteration_count} Summary:")
-        logger.info(f"   Generated: {len(candidates)}")
-        logger.info(f"   Valid: {len(validated)}")
-        logger.info(f"   Total so far: {len(self.discovered_feeds)}")
+        logger.info("Iteration %s Summary:", self.iteration_count)
+        logger.info("   Generated: %s", len(candidates))
+        logger.info("   Valid: %s", len(validated))
+        logger.info("   Total so far: %s", len(self.discovered_feeds))
 
         return iteration_result
     
@@ -927,6 +966,28 @@ class RAGAgent:
         
         return False, "Still discovering feeds"
     
+    def pre_iteration_stop_check(self,
+                                 prepared: Optional[Tuple[Dict, List[str]]] = None) -> Tuple[bool, str]:
+        """
+        Convergence check that needs no new validation results, so it can run
+        before an iteration's candidates are fetched.
+        
+        Args:
+            prepared: Result of prepare_iteration() for the upcoming iteration
+            
+        Returns:
+            Tuple of (should_stop, reason)
+        """
+        should_stop, reason = self.should_stop_iteration()
+        if should_stop:
+            return should_stop, reason
+        
+        if prepared is not None:
+            if not any(url not in self.tested_urls for url in prepared[1]):
+                return True, "No untested candidates generated"
+        
+        return False, "Still discovering feeds"
+    
     def get_stats(self) -> Dict:
         """Get discovery statistics."""
         return {
@@ -954,7 +1015,7 @@ class RAGAgent:
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         
-        logger.info(f"Results saved to {filename}")
+        logger.info("Results saved to %s", filename)
 
 
 # ============================================================================
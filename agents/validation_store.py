@@ -3,6 +3,25 @@ import json
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a feed URL for caching and dedup: lowercase
+    scheme/host, default port, trailing slash and fragment dropped, query
+    parameters sorted."""
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        netloc = (parts.hostname or "").lower()
+        if ":" in netloc:
+            netloc = f"[{netloc}]"
+        if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+            netloc += f":{parts.port}"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((scheme, netloc, parts.path.rstrip("/") or "/", query, ""))
+    except ValueError:
+        return url.strip()
 
 
 class ValidationStore:
@@ -27,6 +46,7 @@ class ValidationStore:
             CREATE TABLE IF NOT EXISTS validations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 url TEXT NOT NULL,
+                url_key TEXT,
                 timestamp TEXT NOT NULL,
                 source TEXT NOT NULL,
                 validator TEXT NOT NULL,
@@ -37,7 +57,15 @@ class ValidationStore:
             );
             """
         )
+        # Databases created before url_key existed: add it and fill it in
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(validations)")}
+        if "url_key" not in columns:
+            cur.execute("ALTER TABLE validations ADD COLUMN url_key TEXT")
+            rows = cur.execute("SELECT id, url FROM validations").fetchall()
+            cur.executemany("UPDATE validations SET url_key = ? WHERE id = ?",
+                            [(normalize_url(url), row_id) for row_id, url in rows])
         cur.execute("CREATE INDEX IF NOT EXISTS idx_validations_url ON validations(url);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_validations_url_key ON validations(url_key, timestamp);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_validations_ts ON validations(timestamp);")
         self.conn.commit()
 
@@ -52,12 +80,29 @@ class ValidationStore:
         ts = datetime.utcnow().isoformat()
         cur = self.conn.cursor()
         cur.execute(
-            "INSERT INTO validations (url, timestamp, source, validator, valid, quality_score, run_id, report) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (url, ts, source, validator, int(bool(valid)), quality_score, run_id, json.dumps(report, ensure_ascii=False))
+            "INSERT INTO validations (url, url_key, timestamp, source, validator, valid, quality_score, run_id, report) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, normalize_url(url), ts, source, validator, int(bool(valid)), quality_score, run_id, json.dumps(report, ensure_ascii=False))
         )
         self.conn.commit()
         return cur.lastrowid
 
+    def fetch_latest(self, url: str, since: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent report for `url` or any spelling of it (see
+        normalize_url), optionally no older than `since` (ISO timestamp)."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT valid, quality_score, timestamp, report FROM validations WHERE url_key = ? AND timestamp >= ? ORDER BY timestamp DESC LIMIT 1",
+            (normalize_url(url), since or "")
+        )
+        r = cur.fetchone()
+        if r is None:
+            return None
+        try:
+            rep = json.loads(r[3])
+        except Exception:
+            rep = {}
+        return {"valid": bool(r[0]), "quality_score": r[1], "timestamp": r[2], "report": rep}
+
     def fetch_recent(self, limit: int = 100):
         cur = self.conn.cursor()
         cur.execute("SELECT id, url, timestamp, source, validator, valid, quality_score, run_id, report FROM validations ORDER BY timestamp DESC LIMIT ?", (limit,))
@@ -21,12 +21,69 @@ from datetime import datetime
 import logging
 import json
 import time
-from validation_store import ValidationStore
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from validation_store import ValidationStore, normalize_url
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def pooled_session(pool_size: int = 32) -> requests.Session:
+    """requests.Session with a keep-alive pool of `pool_size` connections per host.
+    Share one across validators so repeat hosts reuse TCP/TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ValidationCache:
+    """
+    LRU + TTL cache of validation verdicts keyed by normalized URL.
+    
+    Dict-style access, so the same feed proposed under a different
+    spelling (host case, parameter order) is only probed once per TTL.
+    """
+    
+    def __init__(self, maxsize: int = 50_000, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+    
+    def __contains__(self, url) -> bool:
+        key = normalize_url(url)
+        entry = self._data.get(key)
+        if entry is None:
+            return False
+        if entry[0] < time.monotonic():
+            del self._data[key]
+            return False
+        return True
+    
+    def __getitem__(self, url):
+        key = normalize_url(url)
+        self._data.move_to_end(key)
+        return self._data[key][1]
+    
+    def __setitem__(self, url, verdict):
+        key = normalize_url(url)
+        self._data[key] = (time.monotonic() + self.ttl, verdict)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def remove(self, url):
+        """Forget the verdict for `url` so it is validated again."""
+        self._data.pop(normalize_url(url), None)
+
+
 class AIValidatorAgent:
     """
     AI-powered feed validator using Gemini.
@@ -40,11 +97,15 @@ class AIValidatorAgent:
     - Provides reasoning for validation decisions
     """
     
+    # Feeds fetched concurrently by validate_batch(); Gemini calls stay serial
+    FETCH_WORKERS = 20
+    
     def __init__(self, 
                  project_id: str,
                  min_quality_score: int = 60,
                  timeout: int = 10,
-                 location: str = "us-central1"):
+                 location: str = "us-central1",
+                 session: Optional[requests.Session] = None):
         """
         Initialize AI validator agent.
         
@@ -53,6 +114,7 @@ class AIValidatorAgent:
             min_quality_score: Minimum quality score to accept (0-100)
             timeout: HTTP request timeout in seconds
             location: Vertex AI location
+            session: Shared HTTP session (a private pooled one is created if omitted)
         """
         
         self.project_id = project_id
@@ -74,8 +136,11 @@ class AIValidatorAgent:
         self.api_delay = 60.0  # seconds
         self.last_api_call = 0.0
         
+        # Pooled HTTP connections, sized for the concurrent fetches
+        self.session = session or pooled_session(self.FETCH_WORKERS)
+        
         # State tracking
-        self.validation_cache = {}
+        self.validation_cache = ValidationCache(maxsize=50_000, ttl=3600)
         self.url_hashes = {}
         self.validated_feeds = []
         self.rejected_feeds = []
@@ -85,7 +150,7 @@ class AIValidatorAgent:
         except Exception:
             self.store = None
         
-        logger.info(f"AIValidatorAgent initialized (min_quality: {min_quality_score})")
+        logger.info("AIValidatorAgent initialized (min_quality: %s)", min_quality_score)
     
     def _rate_limit(self):
         """Enforce API rate limiting."""
@@ -113,12 +178,19 @@ class AIValidatorAgent:
         time.sleep(wait)
         return True
     
-    def validate_feed(self, url: str, source: str = "legit", run_id: Optional[str] = None) -> Tuple[bool, Dict]:
+    def _fetch(self, url: str) -> requests.Response:
+        """GET a feed over the shared session."""
+        return self.session.get(url, timeout=self.timeout)
+    
+    def validate_feed(self, url: str, source: str = "legit", run_id: Optional[str] = None,
+                      fetched: Optional[Future] = None) -> Tuple[bool, Dict]:
         """
         Validate feed using Gemini AI.
         
         Args:
             url: RSS feed URL to validate
+            fetched: Optional future of an in-flight _fetch(url), started
+                     by validate_batch() so downloads overlap
             
         Returns:
             Tuple of (is_valid, validation_report)
@@ -147,9 +219,13 @@ class AIValidatorAgent:
                     pass
             return False, report
         
-        # Check cache
+        # Check cache, then reports persisted by earlier runs
         if url in self.validation_cache:
             return self.validation_cache[url]
+        stored = self._stored_verdict(url)
+        if stored is not None:
+            self.validation_cache[url] = stored
+            return stored
         
         report = {
             "url": url,
@@ -161,11 +237,11 @@ class AIValidatorAgent:
             "warnings": []
         }
         
-        logger.info(f"AI Validating: {url[:60]}...")
+        logger.info("AI Validating: %s...", url[:60])
         
         # Step 1: Fetch content
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = fetched.result() if fetched is not None else self._fetch(url)
             content = response.text[:5000]  # First 5000 chars
             report["http_status"] = response.status_code
             
@@ -225,10 +301,10 @@ class AIValidatorAgent:
                              len(report["errors"]) == 0)
             
             if report["valid"]:
-                logger.info(f"   Valid (AI score: {report['score']}/100)")
+                logger.info("   Valid (AI score: %s/100)", report['score'])
                 self.validated_feeds.append(report)
             else:
-                logger.info(f"   Invalid (AI score: {report['score']}/100)")
+                logger.info("   Invalid (AI score: %s/100)", report['score'])
                 self.rejected_feeds.append(report)
 
             # Persist report
@@ -242,12 +318,29 @@ class AIValidatorAgent:
             return report["valid"], report
         
         except Exception as e:
-            logger.error(f"AI assessment failed: {e}")
+            logger.error("AI assessment failed: %s", e)
             report["errors"].append(f"AI assessment failed: {str(e)[:50]}")
             self.validation_cache[url] = (False, report)
             self.rejected_feeds.append(report)
             return False, report
     
+    def _stored_verdict(self, url: str) -> Optional[Tuple[bool, Dict]]:
+        """Verdict from a report saved within the cache TTL, if any.
+        
+        Only reports where the feed was actually fetched are reused;
+        timeouts and connection errors are worth retrying.
+        """
+        if not getattr(self, 'store', None):
+            return None
+        since = (datetime.utcnow() - timedelta(seconds=self.validation_cache.ttl)).isoformat()
+        try:
+            row = self.store.fetch_latest(url, since=since)
+        except Exception:
+            return None
+        if not row or "http_status" not in row["report"]:
+            return None
+        return row["valid"], row["report"]
+    
     def _is_feed_format(self, content: str) -> bool:
         """Quick check if content is RSS/Atom."""
         signatures = ["<rss", "<feed", "<?xml", "xmlns"]
@@ -341,7 +434,7 @@ Respond ONLY with this JSON (no other text):
                 try:
                     assessment = json.loads(text)
                 except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse Gemini response (attempt {attempt}): {e}")
+                    logger.error("Failed to parse Gemini response (attempt %s): %s", attempt, e)
                     # If we still have time, back off a bit and retry.
                     elapsed_total = time.time() - start_time
                     remaining_time = max_total_wait - elapsed_total
@@ -375,7 +468,7 @@ Respond ONLY with this JSON (no other text):
 
             except Exception as e:
                 msg = str(e)
-                logger.error(f"Gemini assessment error (attempt {attempt}): {msg}")
+                logger.error("Gemini assessment error (attempt %s): %s", attempt, msg)
                 # If it's a quota/resource issue, treat it as a response time
                 # (we got a quota response) and back off then retry until
                 # the total time budget is exhausted.
@@ -388,7 +481,7 @@ Respond ONLY with this JSON (no other text):
                         logger.error("Gemini quota exceeded after retries; returning fallback assessment")
                         return fallback_assessment
                     sleep = min(backoff * (2 ** (attempt - 1)), max(1, remaining_time))
-                    logger.warning(f"Gemini quota/429 detected, backing off for {sleep}s and retrying...")
+                    logger.warning("Gemini quota/429 detected, backing off for %ss and retrying...", sleep)
                     time.sleep(sleep)
                     continue
                 # Non-retryable error -> raise to let caller record it
@@ -405,7 +498,7 @@ Respond ONLY with this JSON (no other text):
             Validation summary
         """
         
-        logger.info(f"AI Validating {len(feeds)} feeds...")
+        logger.info("AI Validating %s feeds...", len(feeds))
 
         # Extract URLs
         urls_to_validate = []
@@ -417,13 +510,28 @@ Respond ONLY with this JSON (no other text):
             elif isinstance(feed, str):
                 urls_to_validate.append(feed)
 
+        # Download every uncached feed concurrently up front; the checks
+        # and Gemini assessments below then consume them in order
+        pool = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+        fetches = {}
+        for url in urls_to_validate:
+            key = str(url).strip()
+            if not key.startswith("http") or key in fetches or key in self.validation_cache:
+                continue
+            stored = self._stored_verdict(key)
+            if stored is not None:
+                self.validation_cache[key] = stored
+            else:
+                fetches[key] = pool.submit(self._fetch, key)
+
         # Validate each and collect batch-local results
         batch_validated = []
         batch_rejected = []
 
         for url in urls_to_validate:
             try:
-                valid, report = self.validate_feed(url, source=source, run_id=run_id)
+                valid, report = self.validate_feed(url, source=source, run_id=run_id,
+                                                   fetched=fetches.pop(str(url).strip(), None))
             except Exception as e:
                 # If validate_feed raises, record as rejected
                 report = {"url": url, "valid": False, "errors": [str(e)], "timestamp": datetime.now().isoformat()}
@@ -434,6 +542,8 @@ Respond ONLY with this JSON (no other text):
             else:
                 batch_rejected.append(report)
 
+        pool.shutdown(wait=False)
+
         valid_count = len(batch_validated)
         invalid_count = len(batch_rejected)
         total = len(urls_to_validate)
@@ -13,9 +13,16 @@ Date: 2025-10-25
 
 import streamlit as st
 from agents.bharat_agent import BharatConnectAgent
+import logging
 import os
 from google.oauth2 import service_account  # ADD THIS
-import vertexai  # ADD THIS
+from agents.agent_tools import init_vertexai
+
+# Agent progress is logged at DEBUG/INFO; set LOG_LEVEL=DEBUG to trace queries
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 
 # ============================================================================
 # GOOGLE CLOUD CREDENTIALS SETUP (FOR STREAMLIT CLOUD)
@@ -41,9 +48,9 @@ def init_google_cloud():
                 ]
             )
             
-            vertexai.init(
-                project=st.secrets["GCP_PROJECT_ID"],
-                location=st.secrets["GCP_LOCATION"],
+            init_vertexai(
+                st.secrets["GCP_PROJECT_ID"],
+                st.secrets["GCP_LOCATION"],
                 credentials=credentials
             )
             
@@ -58,8 +65,8 @@ def init_google_cloud():
     load_dotenv()
     return None
 
-# Initialize on app start
-init_google_cloud()
+# Initialize on app start; the agent reuses these credentials for BigQuery
+GCP_CREDENTIALS = init_google_cloud()
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -412,7 +419,8 @@ def main_app_page(lang_code):
             st.session_state.agent = BharatConnectAgent(
                 project_id=PROJECT_ID,
                 location=LOCATION,
-                user_language=lang['name']
+                user_language=lang['name'],
+                credentials=GCP_CREDENTIALS
             )
     
     agent = st.session_state.agent
@@ -425,6 +433,7 @@ def main_app_page(lang_code):
     with col2:
         if st.button(f"{lang['change_language']}", key="change_lang"):
             st.session_state.selected_language = None
+            agent.close()
             st.session_state.agent = None
             st.rerun()
     